@@ -73,7 +73,7 @@ async def run_prediction_engine():
     while True:
         try:
             timeframe = SYSTEM_STATE.get("timeframe", "15m")
-            bridge = ExchangeHandler()
+            bridge = ExchangeHandler.shared()
             client = await bridge._get_client(force_public=True)
             
             # 1. Prioritize Current Asset
@@ -140,12 +140,13 @@ async def main():
     logger.info(f"Initializing {SETTINGS.PROJECT_NAME} v{SETTINGS.VERSION}...")
     logger.success("--- SYSTEM PATCH v5.5.0 ACTIVE (EXPERT MODE) ---")
     
+    bot = None
     try:
         # 1. Initialize Telegram Bot (Core UI)
         logger.info("Pillar 1/6: Initializing Telegram Interface...")
         bot = TelegramBot()
         await bot.start_bot()
-        await bot.send_alert(f"🚀 DaNoo v{SETTINGS.VERSION} Expert Mode Online.")
+        await bot.send_alert(f"🚀 DaNoo v{SETTINGS.VERSION} Expert Mode Online.", silent=True)
         
         # 2. Start Web UI Server (Background Task)
         logger.info("Pillar 2/6: Initializing Command Hub Server...")
@@ -188,13 +189,27 @@ async def main():
     except Exception as e:
         logger.error(f"CRITICAL SYSTEM ERROR during boot: {e}")
         # Send alert if possible
-        try: await bot.send_alert(f"⚠️ CRITICAL: DaNoo Engine crashed during boot: {e}")
+        try:
+            await bot.send_alert(f"⚠️ CRITICAL: DaNoo Engine crashed during boot: {e}")
+            await bot.flush()
         except: pass
     finally:
+        if bot is not None:
+            try:
+                await bot.stop_bot()
+            except Exception as e:
+                logger.warning(f"Telegram shutdown: {e}")
         logger.info("Clean shutdown complete.")
 
 if __name__ == "__main__":
+    # The Web UI is served from this loop (ui_server.serve()), so uvloop must drive main() itself;
+    # uvicorn's own `loop` setting only applies when uvicorn creates the loop. Not available on Windows.
+    try:
+        import uvloop
+        run = uvloop.run
+    except ImportError:
+        run = asyncio.run
     try:
-        asyncio.run(main())
+        run(main())
     except KeyboardInterrupt:
         pass
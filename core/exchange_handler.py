@@ -1,14 +1,31 @@
 import ccxt.async_support as ccxt
-import pandas as pd
 import numpy as np
 import asyncio
 import time
+import ssl
+import aiohttp
+import certifi
 from loguru import logger
 from config.settings import SETTINGS
 
 # --- Persistent Global Clients ---
 _CLIENT_INSTANCE = None
 _PUBLIC_CLIENT = None
+_HTTP_SESSION = None
+
+def _http_session() -> aiohttp.ClientSession:
+    """
+    One aiohttp session (connection pool, DNS cache, TLS context) shared by both ccxt
+    clients, instead of one per client. Must be created inside the running loop.
+    """
+    global _HTTP_SESSION
+    if _HTTP_SESSION is None or _HTTP_SESSION.closed:
+        connector = aiohttp.TCPConnector(
+            ssl=ssl.create_default_context(cafile=certifi.where()), # same trust store ccxt uses
+            limit=50, ttl_dns_cache=300, enable_cleanup_closed=True
+        )
+        _HTTP_SESSION = aiohttp.ClientSession(connector=connector, trust_env=False)
+    return _HTTP_SESSION
 
 async def get_exchange_client(force_public=False):
     global _CLIENT_INSTANCE, _PUBLIC_CLIENT
@@ -19,6 +36,7 @@ async def get_exchange_client(force_public=False):
             exchange_class = getattr(ccxt, exchange_id)
             # Public mainnet client for real data display
             _PUBLIC_CLIENT = exchange_class({
+                'session': _http_session(),
                 'enableRateLimit': True,
                 'options': {'defaultType': 'linear' if exchange_id == "bybit" else 'future'}
             })
@@ -38,6 +56,7 @@ async def get_exchange_client(force_public=False):
 
         exchange_class = getattr(ccxt, exchange_id)
         config = {
+            'session': _http_session(),
             'apiKey': api_key,
             'secret': secret,
             'enableRateLimit': True,
@@ -64,11 +83,62 @@ async def get_exchange_client(force_public=False):
         _CLIENT_INSTANCE = client
     return _CLIENT_INSTANCE
 
+async def close_exchange_clients():
+    """Closes the persistent clients and their shared aiohttp session; call once on shutdown."""
+    global _CLIENT_INSTANCE, _PUBLIC_CLIENT, _HTTP_SESSION
+    for client in (_CLIENT_INSTANCE, _PUBLIC_CLIENT):
+        if client is not None:
+            try:
+                await client.close()
+            except Exception as e:
+                logger.warning(f"Exchange Bridge: Error closing client: {e}")
+    # ccxt does not close a session it was handed
+    if _HTTP_SESSION is not None:
+        await _HTTP_SESSION.close()
+    _CLIENT_INSTANCE = None
+    _PUBLIC_CLIENT = None
+    _HTTP_SESSION = None
+
+# --- Short-lived public ticker cache (dashboard polls) ---
+LAST_PRICE_TTL = 3.0 # seconds
+_LAST_PRICE = {} # symbol -> (fetched_at, last price)
+_PRICE_INFLIGHT = {} # symbol -> Task fetching its ticker
+
+async def _fetch_last_price(symbol: str) -> float:
+    client = await get_exchange_client(force_public=True)
+    ticker = await client.fetch_ticker(symbol)
+    price = ticker.get("last") or 0.0
+    _LAST_PRICE[symbol] = (time.monotonic(), price)
+    return price
+
+async def fetch_last_price(symbol: str, ttl: float = LAST_PRICE_TTL) -> float:
+    """Last traded price from the public client, reused for `ttl` seconds. Raises on fetch failure."""
+    hit = _LAST_PRICE.get(symbol)
+    if hit and time.monotonic() - hit[0] < ttl:
+        return hit[1]
+    # Single-flight: concurrent misses for one symbol share a single fetch_ticker call
+    task = _PRICE_INFLIGHT.get(symbol)
+    if task is None:
+        task = asyncio.create_task(_fetch_last_price(symbol))
+        _PRICE_INFLIGHT[symbol] = task
+        task.add_done_callback(lambda _: _PRICE_INFLIGHT.pop(symbol, None))
+    # shield: a cancelled caller must not cancel the fetch the others are waiting on
+    return await asyncio.shield(task)
+
 class ExchangeHandler:
+    _shared = None
+
     def __init__(self):
         self.api_key = SETTINGS.BYBIT_API_KEY if SETTINGS.EXCHANGE_ID == "bybit" else SETTINGS.BINANCE_API_KEY
         self.use_sandbox = SETTINGS.USE_SANDBOX
 
+    @classmethod
+    def shared(cls) -> "ExchangeHandler":
+        """Process-wide handler for request handlers (the clients behind it are global anyway)."""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
     async def _get_client(self, force_public=False):
         return await get_exchange_client(force_public)
 
@@ -97,24 +167,27 @@ class ExchangeHandler:
             client = await self._get_client(force_public=True)
             await client.load_markets()
             ohlcv = await client.fetch_ohlcv(symbol, timeframe, limit=100)
-            df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+            arr = np.asarray(ohlcv, dtype=np.float64).reshape(-1, 6)
+            closes = arr[:, 4]
             
-            delta = df['close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / (loss + 1e-10)
-            rsi = 100 - (100 / (1 + rs))
-            current_rsi = rsi.iloc[-1]
+            # Simple-average RSI over the last 14 changes (only the latest value is displayed)
+            current_rsi = np.nan
+            if closes.shape[0] > 14:
+                delta = np.diff(closes[-15:])
+                gain = np.where(delta > 0, delta, 0.0).mean()
+                loss = np.where(delta < 0, -delta, 0.0).mean()
+                rs = gain / (loss + 1e-10)
+                current_rsi = 100 - (100 / (1 + rs))
             
             funding = await client.fetch_funding_rate(symbol)
             funding_rate = funding.get('fundingRate', 0.0) * 100 
-            price = df['close'].iloc[-1]
+            price = ohlcv[-1][4]
             
             return {
                 "price": price,
                 "rsi": round(float(current_rsi), 2) if not np.isnan(current_rsi) else 50.0,
                 "funding_rate": round(funding_rate, 4),
-                "timestamp": df['timestamp'].iloc[-1]
+                "timestamp": ohlcv[-1][0]
             }
         except Exception as e:
             logger.error(f"Exchange Bridge Error: {str(e)}")
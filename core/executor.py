@@ -1,7 +1,9 @@
 from loguru import logger
 from typing import Dict, Any
 import time
+import asyncio
 from core.execution_engine import ExecutionEngine
+from core.strategy_kind import StrategyKind
 
 class StrategicBridge:
     """
@@ -62,6 +64,15 @@ class StrategicBridge:
             "reason": "Neutral market conditions: No strategic edge detected."
         }
 
+    def _has_open_position(self, symbol: str) -> bool:
+        """Blocking DB lookup: call via asyncio.to_thread."""
+        from database.models import DB_SESSION, has_open_trade
+        session = DB_SESSION()
+        try:
+            return has_open_trade(session, symbol, strategy="STRATEGIC_BRIDGE")
+        finally:
+            session.close()
+
     async def execute_strategic_trade(self, state: Dict[str, Any], decision_data: Dict[str, Any]):
         """
         Actually executes a trade based on strategic alignment.
@@ -70,6 +81,11 @@ class StrategicBridge:
              return False
 
         symbol = state.get("symbol", "BTCUSDT")
+        # One strategic position per asset: an alignment that lasts several hours must not stack entries
+        if await asyncio.to_thread(self._has_open_position, symbol):
+            logger.info(f"STRATEGIC HOLD: {symbol} position already open, entry skipped")
+            return False
+
         regime = state.get("regime", "UNKNOWN")
         side = "buy" if regime == "BULL_TREND" else "sell"
         price = state.get("price", 0.0)
@@ -95,45 +111,48 @@ class StrategicBridge:
         result = await self.executor.execute_order(symbol, side, amount, price)
         
         if result["status"] == "FILLED":
-            from database.models import DB_SESSION, Trade
-            from datetime import datetime
-            from web_ui.state import ACTIVE_TRADES, LOG_HISTORY
+            from database.models import DB_SESSION, Trade, ts_ms
+            from web_ui.state import ActiveTrade, add_active_trade
             
             session = DB_SESSION()
-            # Generate Unique Trade Code
-            trade_count = session.query(Trade).filter(Trade.symbol == symbol).count()
-            side_code = "L" if side.upper() == "BUY" else "S"
-            trade_code = f"{symbol.split('USDT')[0]}-{side_code}-{trade_count+1:02d}"
+            try:
+                # Generate Unique Trade Code
+                trade_count = session.query(Trade).filter(Trade.symbol == symbol).count()
+                side_code = "L" if side.upper() == "BUY" else "S"
+                trade_code = f"{symbol.split('USDT')[0]}-{side_code}-{trade_count+1:02d}"
 
-            new_trade = Trade(
-                symbol=symbol, side=side, amount=amount, entry_price=price,
-                entry_time=datetime.utcnow(), status="OPEN", order_id=result["order_id"],
-                strategy="STRATEGIC_BRIDGE", leverage=1, trade_code=trade_code
-            )
-            session.add(new_trade)
-            session.commit()
+                new_trade = Trade(
+                    symbol=symbol, side=side, amount=amount, entry_price=price,
+                    entry_time=ts_ms(), status="OPEN", order_id=result["order_id"],
+                    strategy="STRATEGIC_BRIDGE", leverage=1, trade_code=trade_code
+                )
+                session.add(new_trade)
+                session.commit()
 
-            ACTIVE_TRADES.append({
-                "id": new_trade.id, 
-                "trade_code": trade_code,
-                "time": new_trade.entry_time.timestamp(),
-                "symbol": symbol, 
-                "type": f"{side.upper()} (STRATEGIC)", 
-                "status": "OPEN",
-                "pnl": "$0.00", 
-                "cost": f"${(amount * price):.2f}",
-                "entry_price": price,
-                "amount": amount,
-                "order_id": new_trade.order_id, 
-                "reason": "STRATEGIC_BRIDGE",
-                "conviction": "95%", 
-                "risk": "LOW", 
-                "leverage": 1
-            })
+                add_active_trade(ActiveTrade(
+                    id=new_trade.id,
+                    trade_code=trade_code,
+                    time=new_trade.entry_time / 1000,
+                    symbol=symbol,
+                    side=side.upper(),
+                    type=f"{side.upper()} (STRATEGIC)",
+                    status="OPEN",
+                    pnl="$0.00",
+                    cost=f"${(amount * price):.2f}",
+                    entry_price=price,
+                    amount=amount,
+                    order_id=new_trade.order_id,
+                    reason="STRATEGIC_BRIDGE",
+                    kind=StrategyKind.STRATEGIC_BRIDGE,
+                    conviction="95%",
+                    risk="LOW",
+                    leverage=1
+                ))
 
-            logger.success(f"STRATEGIC SUCCESS: {symbol} pos opened via {decision_data['reason']}")
-            session.close()
-            return True
+                logger.success(f"STRATEGIC SUCCESS: {symbol} pos opened via {decision_data['reason']}")
+                return True
+            finally:
+                session.close()
         else:
             logger.error(f"STRATEGIC FAILURE: Execution rejected: {result.get('reason')}")
             return False
@@ -0,0 +1,155 @@
+"""
+Numba-compiled indicator kernels for the scanner hot path.
+Math mirrors StrategyLibrary (pandas ewm adjust=False, Wilder RSI, slow Stochastic),
+but only the tail values the entry rules read are produced, in one pass per series.
+Kernels are nogil so a thread pool runs them in true parallel.
+"""
+import numpy as np
+from numba import njit
+
+@njit(nogil=True, cache=True)
+def _ema_last(data, period):
+    n = data.shape[0]
+    if n == 0:
+        return np.nan
+    alpha = 2.0 / (period + 1.0)
+    ema = float(data[0])
+    for i in range(1, n):
+        ema = alpha * data[i] + (1.0 - alpha) * ema
+    return ema
+
+@njit(nogil=True, cache=True)
+def rsi_step(avg_gain, avg_loss, change, period):
+    """One Wilder smoothing step: returns (avg_gain, avg_loss, rsi) after `change`."""
+    gain = change if change > 0 else 0.0
+    loss = -change if change < 0 else 0.0
+    avg_gain = (avg_gain * (period - 1) + gain) / period
+    avg_loss = (avg_loss * (period - 1) + loss) / period
+    rs = 100.0 if avg_loss == 0 else avg_gain / (avg_loss + 1e-10)
+    return avg_gain, avg_loss, 100.0 - (100.0 / (1.0 + rs))
+
+@njit(nogil=True, cache=True)
+def _rsi_averages(close, period):
+    """Wilder average gain/loss at the last bar (requires len(close) > period)."""
+    n = close.shape[0]
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, period + 1):
+        delta = close[i] - close[i - 1]
+        if delta > 0:
+            avg_gain += delta
+        else:
+            avg_loss -= delta
+    avg_gain /= period
+    avg_loss /= period
+    for i in range(period + 1, n):
+        avg_gain, avg_loss, _ = rsi_step(avg_gain, avg_loss, close[i] - close[i - 1], period)
+    return avg_gain, avg_loss
+
+@njit(nogil=True, cache=True)
+def _rsi_last(close, period):
+    if close.shape[0] <= period:
+        return np.nan
+    avg_gain, avg_loss = _rsi_averages(close, period)
+    rs = 100.0 if avg_loss == 0 else avg_gain / (avg_loss + 1e-10)
+    return 100.0 - (100.0 / (1.0 + rs))
+
+@njit(nogil=True, cache=True)
+def _stoch_raw(high, low, close, i, k_period):
+    """Raw %K at bar i (NaN during warm-up)."""
+    if i < k_period - 1:
+        return np.nan
+    low_min = low[i]
+    high_max = high[i]
+    for j in range(i - k_period + 1, i):
+        if low[j] < low_min:
+            low_min = low[j]
+        if high[j] > high_max:
+            high_max = high[j]
+    return 100.0 * (close[i] - low_min) / (high_max - low_min + 1e-10)
+
+@njit(nogil=True, cache=True)
+def _stoch_k(high, low, close, i, k_period, slow_period):
+    """Slowed %K at bar i: mean of the last `slow_period` raw values."""
+    if i < 0 or i - slow_period + 1 < k_period - 1:
+        return np.nan
+    total = 0.0
+    for j in range(i - slow_period + 1, i + 1):
+        total += _stoch_raw(high, low, close, j, k_period)
+    return total / slow_period
+
+@njit(nogil=True, cache=True)
+def _stoch_d(high, low, close, i, k_period, d_period, slow_period):
+    """%D at bar i: mean of the last `d_period` slowed %K values."""
+    total = 0.0
+    for j in range(i - d_period + 1, i + 1):
+        total += _stoch_k(high, low, close, j, k_period, slow_period)
+    return total / d_period
+
+@njit(nogil=True, cache=True)
+def scalper_kernel(high, low, close):
+    """
+    Fused scalper indicators over one symbol's 1m bars.
+    Returns (ema9, ema21, k, d, prev_k, prev_d, rsi14) at the last bar.
+    """
+    n = close.shape[0]
+    ema9 = _ema_last(close, 9)
+    ema21 = _ema_last(close, 21)
+    rsi14 = _rsi_last(close, 14)
+    if n < 9:
+        return ema9, ema21, np.nan, np.nan, np.nan, np.nan, rsi14
+    k = _stoch_k(high, low, close, n - 1, 9, 3)
+    d = _stoch_d(high, low, close, n - 1, 9, 3, 3)
+    prev_k = _stoch_k(high, low, close, n - 2, 9, 3)
+    prev_d = _stoch_d(high, low, close, n - 2, 9, 3, 3)
+    return ema9, ema21, k, d, prev_k, prev_d, rsi14
+
+class StreamingRSI:
+    """
+    Wilder RSI carried across cycles: seeded once from history, then O(1)
+    per newly closed candle via rsi_step.
+    """
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.reset()
+
+    def reset(self):
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.last_ts = None
+        self.last_close = None
+
+    @property
+    def warm(self) -> bool:
+        return self.last_ts is not None
+
+    def seed(self, timestamps, closes) -> bool:
+        """Cold start from closed candles; returns False if history is too short."""
+        closes = np.ascontiguousarray(closes, dtype=np.float64)
+        if closes.shape[0] <= self.period:
+            return False
+        self.avg_gain, self.avg_loss = _rsi_averages(closes, self.period)
+        self.last_ts = int(timestamps[-1])
+        self.last_close = float(closes[-1])
+        return True
+
+    def update(self, ts: int, close: float) -> float:
+        """Commits one newly closed candle and returns the RSI at it."""
+        self.avg_gain, self.avg_loss, rsi = rsi_step(self.avg_gain, self.avg_loss, close - self.last_close, self.period)
+        self.last_ts = int(ts)
+        self.last_close = float(close)
+        return rsi
+
+    def peek(self, close: float) -> float:
+        """RSI with `close` as the next (still forming) bar, without committing it."""
+        return rsi_step(self.avg_gain, self.avg_loss, close - self.last_close, self.period)[2]
+
+def warmup():
+    """
+    Compiles (or loads from the on-disk cache) every kernel for the dtypes the
+    hot paths pass, so the first scan cycle does not pay JIT latency.
+    """
+    bars = np.linspace(1.0, 2.0, 32).astype(np.float32)
+    scalper_kernel(bars, bars, bars)
+    _rsi_averages(bars.astype(np.float64), 14)
+    rsi_step(0.0, 0.0, 0.0, 14)
@@ -15,12 +15,15 @@ class RegimeEngine:
         """
         Classifies the latest market regime.
         """
-        if len(df) < 50:
+        # to_numpy() works for both pandas and polars frames
+        return self.analyze_arrays(df['high'].to_numpy(), df['low'].to_numpy(), df['close'].to_numpy())
+
+    def analyze_arrays(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> str:
+        """
+        Same classification straight from OHLC column arrays (no DataFrame needed).
+        """
+        if len(close) < 50:
             return "UNKNOWN"
-            
-        close = df['close'].values
-        high = df['high'].values
-        low = df['low'].values
         
         # 1. Trend Analysis (EMA 20 vs 50)
         ema20 = StrategyLibrary.calculate_ema(close, 20)
@@ -1,15 +1,29 @@
 import asyncio
+import os
 import numpy as np
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from loguru import logger
 from core.exchange_handler import ExchangeHandler
-from core.strategy_library import StrategyLibrary
+from core.indicator_kernels import scalper_kernel
 from core.execution_engine import ExecutionEngine
+from core.strategy_kind import StrategyKind, SCALP_KINDS
 from config.settings import SETTINGS
-from database.models import DB_SESSION, Trade
-from datetime import datetime
+from database.models import DB_SESSION, Trade, ts_ms
 import time
 
+# ─── Regime Risk Multipliers ─────────────────────────────────────
+# Trend regimes apply the Momentum weight only when trading with the trend
+_REGIME_TREND_SIDE = {"BULL_TREND": "BUY", "BEAR_TREND": "SELL"}
+_REGIME_FIXED = {"HIGH_VOLATILITY": 0.7, "COMPRESSED": 1.2}
+
+def compute_regime_mult(regime: str, side: str, weights: dict) -> float:
+    """Risk multiplier for a trade of `side` under `regime`, given the regime weights."""
+    if _REGIME_TREND_SIDE.get(regime) == side:
+        return weights.get("Momentum", 1.0)
+    if regime == "RANGING":
+        return weights.get("MeanReversion", 1.0)
+    return _REGIME_FIXED.get(regime, 1.0)
+
 class ScalperEngine:
     """
     Hybrid Scalper Engine (Based on Proven LTF Strategies).
@@ -21,10 +35,21 @@ class ScalperEngine:
         self.bridge = ExchangeHandler()
         self.executor = ExecutionEngine(mode=SETTINGS.MODE)
         self.last_scan_time = 0
+        self._client = None
+        # Indicator kernels release the GIL, so threads compute symbols in parallel
+        self._pool = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="scalper-kernel")
+
+    async def _client_once(self):
+        """Resolves the exchange client and loads its markets once; later calls reuse it."""
+        if self._client is None:
+            client = await self.bridge._get_client()
+            await client.load_markets()
+            self._client = client
+        return self._client
 
     async def scan_market(self):
         """Monitor every asset in the watchlist (1m heartbeat)."""
-        from web_ui.state import SYSTEM_STATE, LOG_HISTORY, ACTIVE_TRADES, LIQUIDITY_STATE
+        from web_ui.state import SYSTEM_STATE, SCALP_INDEX, LIQUIDITY_STATE
         
         # Don't overlap scans
         if time.time() - self.last_scan_time < 50:
@@ -36,68 +61,69 @@ class ScalperEngine:
         # 1. Manage Open Scalps First
         await self.manage_open_positions()
 
-        # 2. Iterate through Watchlist
-        for symbol in SETTINGS.WATCHLIST:
+        # 2. Batch-fetch 1m bars for the whole watchlist
+        try:
+            client = await self._client_once()
+        except Exception as e:
+            logger.error(f"[Scalper] Scan Error: {e}")
+            return
+        watchlist = list(SETTINGS.WATCHLIST)
+        fetched = await asyncio.gather(
+            *(client.fetch_ohlcv(symbol, "1m", limit=100) for symbol in watchlist),
+            return_exceptions=True
+        )
+
+        # 3. Calculate Indicators: one fused kernel per symbol on the thread pool
+        loop = asyncio.get_running_loop()
+        jobs = []
+        for symbol, ohlcv in zip(watchlist, fetched):
             try:
-                client = await self.bridge._get_client()
-                ohlcv = await client.fetch_ohlcv(symbol, "1m", limit=100)
-                df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-                
-                close = df['close'].values
-                high = df['high'].values
-                low = df['low'].values
+                if isinstance(ohlcv, Exception):
+                    raise ohlcv
+                # float32 rows for the indicator path (timestamp column is unused here)
+                cols = np.ascontiguousarray(np.asarray(ohlcv, dtype=np.float32).T)
+                high, low, close = cols[2], cols[3], cols[4]
+                jobs.append((symbol, ohlcv, loop.run_in_executor(self._pool, scalper_kernel, high, low, close)))
+            except Exception as e:
+                logger.error(f"[Scalper] Scan Error [{symbol}]: {e}")
 
-                # 3. Calculate Indicators
-                ema9 = StrategyLibrary.calculate_ema(close, 9)
-                ema21 = StrategyLibrary.calculate_ema(close, 21)
-                stoch = StrategyLibrary.calculate_stochastic(high, low, close, 9, 3, 3)
-                
-                curr_price = close[-1]
-                curr_k = stoch['k'][-1]
-                curr_d = stoch['d'][-1]
-                prev_k = stoch['k'][-2]
-                prev_d = stoch['d'][-2]
+        indicators = await asyncio.gather(*(job[2] for job in jobs), return_exceptions=True)
+
+        # 4. Evaluate entries per symbol
+        for (symbol, ohlcv, _), result in zip(jobs, indicators):
+            try:
+                if isinstance(result, Exception):
+                    raise result
+                ema9, ema21, curr_k, curr_d, prev_k, prev_d, rsi1m = result
+                curr_price = float(ohlcv[-1][4]) # full-precision price for sizing and PnL
                 
-                trend_up = ema9[-1] > ema21[-1]
-                trend_down = ema9[-1] < ema21[-1]
+                # Shared predicates, evaluated once per symbol
+                trend_up = ema9 > ema21
+                trend_down = ema9 < ema21
+                cross_up = prev_k < prev_d and curr_k > curr_d
+                cross_down = prev_k > prev_d and curr_k < curr_d
 
                 strat_strict = SYSTEM_STATE.get("strat_strict", True)
                 strat_loose = SYSTEM_STATE.get("strat_loose", False)
                 strat_recon = SYSTEM_STATE.get("strat_recon", False)
 
-                # 4. Entry Logic
-                signal = None
-                strategy_matched = "UNKNOWN"
-                
-                if strat_strict and signal is None:
-                    if trend_up and prev_k < prev_d and curr_k > curr_d and curr_k < 30:
-                        signal = "BUY"
-                        strategy_matched = "STRICT_SCALP"
-                    elif trend_down and prev_k > prev_d and curr_k < curr_d and curr_k > 70:
-                        signal = "SELL"
-                        strategy_matched = "STRICT_SCALP"
-                        
-                if strat_loose and signal is None:
-                    if trend_up and prev_k < prev_d and curr_k > curr_d and curr_k < 50:
-                        signal = "BUY"
-                        strategy_matched = "LOOSE_SCALP"
-                    elif trend_down and prev_k > prev_d and curr_k < curr_d and curr_k > 50:
-                        signal = "SELL"
-                        strategy_matched = "LOOSE_SCALP"
-                        
-                if strat_recon and signal is None:
-                    # Fast momentum proxy via 1m RSI to sync with Intel direction
-                    rsi1m = StrategyLibrary.calculate_rsi(close, 14)[-1]
-                    if rsi1m > 65 and trend_up:
-                        signal = "BUY"
-                        strategy_matched = "RECON_SYNC"
-                    elif rsi1m < 35 and trend_down:
-                        signal = "SELL"
-                        strategy_matched = "RECON_SYNC"
+                # Entry Logic: ordered rule table, first enabled hit wins
+                rules = (
+                    (strat_strict, trend_up and cross_up and curr_k < 30, "BUY", "STRICT_SCALP"),
+                    (strat_strict, trend_down and cross_down and curr_k > 70, "SELL", "STRICT_SCALP"),
+                    (strat_loose, trend_up and cross_up and curr_k < 50, "BUY", "LOOSE_SCALP"),
+                    (strat_loose, trend_down and cross_down and curr_k > 50, "SELL", "LOOSE_SCALP"),
+                    (strat_recon, rsi1m > 65 and trend_up, "BUY", "RECON_SYNC"),
+                    (strat_recon, rsi1m < 35 and trend_down, "SELL", "RECON_SYNC"),
+                )
+                signal, strategy_matched = next(
+                    ((side, label) for enabled, hit, side, label in rules if enabled and hit),
+                    (None, "UNKNOWN")
+                )
 
                 if signal:
                     # ONE active sub-trade per symbol
-                    existing = any(t for t in ACTIVE_TRADES if t["symbol"] == symbol and ("SCALP" in t["reason"] or "RECON" in t["reason"]))
+                    existing = bool(SCALP_INDEX.get(symbol))
                     if not existing:
                         # 4.5. Institutional Liquidity Filter (EXPERT MODE)
                         liq = LIQUIDITY_STATE.get(symbol)
@@ -108,8 +134,8 @@ class ScalperEngine:
                             # ─── EXPERT DECISION MATRIX ───
                             # 1. Wall Support (Strongest)
                             # RELAXED ZONE: 0.5% proximity to walls instead of 0.3%
-                            on_wall = (signal == "BUY" and abs(current_price - liq.get("support", 0))/current_price < 0.005) or \
-                                      (signal == "SELL" and abs(current_price - liq.get("resistance", 0))/current_price < 0.005)
+                            on_wall = (signal == "BUY" and abs(curr_price - liq.get("support", 0))/curr_price < 0.005) or \
+                                      (signal == "SELL" and abs(curr_price - liq.get("resistance", 0))/curr_price < 0.005)
                             
                             # 2. Imbalance Support (Momentum)
                             strong_imbalance = (signal == "BUY" and imbalance > 0.12) or (signal == "SELL" and imbalance < -0.12)
@@ -134,9 +160,13 @@ class ScalperEngine:
                             # If no liquidity data, assume neutral but don't grant "Backed" status
                             logger.info(f"[Scalper] No depth data for {symbol}. Trading on technicals only.")
 
+                        # Depth data that does not back the signal vetoes the entry (logged as SKIPPED above)
+                        if liq and not is_backed:
+                            continue
+
                         # ─── Snapshot Context for AI Audit ───
                         context = {
-                            "rsi": float(StrategyLibrary.calculate_rsi(close, 14)[-1]),
+                            "rsi": float(rsi1m),
                             "stoch_k": float(curr_k),
                             "stoch_d": float(curr_d),
                             "trend": "UP" if trend_up else "DOWN",
@@ -144,130 +174,126 @@ class ScalperEngine:
                             "liquidity": liq # This is the full scan result
                         }
 
-                        logger.warning(f"[Scalper] SIGNAL: {signal} detected for {symbol} at ${curr_price} via {final_reason}")
-                        await self.execute_scalp(symbol, signal, curr_price, reason=final_reason, context=context)
-                
-                await asyncio.sleep(0.5)
+                        logger.warning(f"[Scalper] SIGNAL: {signal} detected for {symbol} at ${curr_price} via {strategy_matched}")
+                        await self.execute_scalp(symbol, signal, curr_price, reason=strategy_matched, context=context)
 
             except Exception as e:
                 logger.error(f"[Scalper] Scan Error [{symbol}]: {e}")
 
     async def manage_open_positions(self):
         """Monitors open scalps and executes exits based on TP/SL."""
-        from web_ui.state import ACTIVE_TRADES, LOG_HISTORY, SYSTEM_STATE, TRADE_LOG_HISTORY
+        from web_ui.state import ACTIVE_TRADES, SYSTEM_STATE, TRADE_LOG_HISTORY, untrack_scalp, log_event
         
-        current_price = SYSTEM_STATE.get("price", 0.0)
+        scalps = [t for t in ACTIVE_TRADES.values() if t.kind in SCALP_KINDS]
+        if not scalps:
+            return
+
+        # Fresh price per trade; a failed fetch leaves NaN, which never triggers an exit
+        prices = np.full(len(scalps), np.nan)
+        for i, trade in enumerate(scalps):
+            try:
+                client = await self._client_once()
+                ticker = await client.fetch_ticker(trade.symbol)
+                prices[i] = ticker['last']
+            except Exception as e:
+                logger.error(f"[Scalper] Position Management Error: {e}")
+
+        # Vectorized PnL sweep over all open scalps at once
+        entries = np.fromiter((t.entry_price for t in scalps), dtype=np.float64, count=len(scalps))
+        signs = np.fromiter((1.0 if t.side == "BUY" else -1.0 for t in scalps), dtype=np.float64, count=len(scalps))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pnl_pcts = (prices - entries) / entries * signs
+        take_profit = pnl_pcts >= 0.005 # 0.5% TP
+        stop_loss = pnl_pcts <= -0.003 # 0.3% SL
 
         to_close = []
-        for trade in ACTIVE_TRADES:
-            if "SCALP" not in trade["reason"]: continue
+        for i in np.flatnonzero(take_profit | stop_loss):
+            trade = scalps[i]
+            price = float(prices[i])
+            pnl_pct = float(pnl_pcts[i])
+            exit_reason = "TAKE_PROFIT" if take_profit[i] else "STOP_LOSS"
             
+            session = DB_SESSION()
             try:
-                # Fresh price for the specific symbol
-                client = await self.bridge._get_client()
-                ticker = await client.fetch_ticker(trade["symbol"])
-                price = ticker['last']
-
-                session = DB_SESSION()
-                db_t = session.query(Trade).filter(Trade.order_id == trade["order_id"]).first()
+                db_t = session.query(Trade).filter(Trade.order_id == trade.order_id).first()
                 if not db_t: 
-                    session.close()
                     continue
                 
                 entry_price = db_t.entry_price
                 side = db_t.side
                 amount = db_t.amount
-                leverage = trade.get("leverage", 1)
-                pnl_pct = ((price - entry_price) / entry_price) if side == "BUY" else ((entry_price - price) / entry_price)
+                leverage = trade.leverage
+                
+                close_side = "sell" if side == "BUY" else "buy"
+                close_amount = db_t.amount
                 
-                exit_triggered = False
-                exit_reason = ""
-                if pnl_pct >= 0.005: 
-                    exit_triggered = True # 0.5% TP
-                    exit_reason = "TAKE_PROFIT"
-                elif pnl_pct <= -0.003: 
-                    exit_triggered = True # 0.3% SL
-                    exit_reason = "STOP_LOSS"
+                # ⚡ Use Execution Engine to respect PAPER/REAL mode
+                result = await self.executor.execute_order(trade.symbol, close_side, close_amount, price)
                 
-                if exit_triggered:
-                    close_side = "sell" if side == "BUY" else "buy"
-                    close_amount = db_t.amount
+                if result["status"] == "FILLED":
+                    db_t.status = "CLOSED"
+                    db_t.exit_price = price
+                    db_t.exit_time = ts_ms()
+                    final_pnl = (price - entry_price) * close_amount * (1 if side == "BUY" else -1)
+                    db_t.pnl = final_pnl
+                    session.commit()
+                    to_close.append(trade)
                     
-                    # ⚡ Use Execution Engine to respect PAPER/REAL mode
-                    result = await self.executor.execute_order(trade["symbol"], close_side, close_amount, price)
+                    log_msg = f"SCALPER: Finalized {trade.symbol} scalp at ${price} ({pnl_pct*100:.2f}%) via {exit_reason}"
+                    log_event(log_msg)
                     
-                    if result["status"] == "FILLED":
-                        db_t.status = "CLOSED"
-                        db_t.exit_price = price
-                        db_t.exit_time = datetime.utcnow()
-                        final_pnl = (price - entry_price) * close_amount * (1 if side == "BUY" else -1)
-                        db_t.pnl = final_pnl
-                        session.commit()
-                        to_close.append(trade)
-                        
-                        log_msg = f"SCALPER: Finalized {trade['symbol']} scalp at ${price} ({pnl_pct*100:.2f}%) via {exit_reason}"
-                        LOG_HISTORY.append({"time": time.time(), "msg": log_msg})
-                        
-                        # Specialized Trade Log for Intelligence
-                        TRADE_LOG_HISTORY.append({
-                            "timestamp": time.time(),
-                            "action": "EXIT",
-                            "symbol": trade["symbol"],
-                            "type": side,
-                            "price": price,
-                            "amount": amount,
-                            "leverage": leverage,
-                            "pnl": final_pnl,
-                            "pnl_pct": pnl_pct * 100,
-                            "reason": exit_reason
-                        })
-
-                session.close()
+                    # Specialized Trade Log for Intelligence
+                    TRADE_LOG_HISTORY.append({
+                        "timestamp": time.time(),
+                        "action": "EXIT",
+                        "symbol": trade.symbol,
+                        "type": side,
+                        "price": price,
+                        "amount": amount,
+                        "leverage": leverage,
+                        "pnl": final_pnl,
+                        "pnl_pct": pnl_pct * 100,
+                        "reason": exit_reason
+                    })
             except Exception as e:
                 logger.error(f"[Scalper] Position Management Error: {e}")
+            finally:
+                session.close()
 
         for t in to_close:
-            if t in ACTIVE_TRADES: ACTIVE_TRADES.remove(t)
+            ACTIVE_TRADES.pop(t.order_id, None)
+            untrack_scalp(t.symbol, t.kind)
 
     async def execute_scalp(self, symbol: str, side: str, price: float, reason: str = "STRICT_SCALP", context: dict = None):
         """Execute and Persist Scalp Trade using Dynamic Position Sizing."""
-        from web_ui.state import ACTIVE_TRADES, LOG_HISTORY, SYSTEM_STATE, TRADE_LOG_HISTORY
+        from web_ui.state import SYSTEM_STATE, TRADE_LOG_HISTORY, ActiveTrade, add_active_trade, track_scalp, log_event
         from config.risk_config import RISK_CONFIG
         
+        kind = StrategyKind.from_reason(reason)
+        
+        # Snapshot shared state once so sizing sees a consistent view
+        state = SYSTEM_STATE
+        n_assets = len(SETTINGS.WATCHLIST)
+        total_equity = state.get("equity", 1000.0 * n_assets)
+        regime = state.get("regime", "RANGING")
+        regime_weights = state.get("regime_weights", {})
+        
         # 1. Base Portfolio Constraint - Use per-asset slice
-        total_equity = SYSTEM_STATE.get("equity", 1000.0 * len(SETTINGS.WATCHLIST))
-        equity = total_equity / len(SETTINGS.WATCHLIST) if len(SETTINGS.WATCHLIST) > 0 else 1000.0
+        equity = total_equity / n_assets if n_assets > 0 else 1000.0
         
         # 2. Base Risk Allocation (default: 1% of equity slice to risk losing)
         base_risk_amount = equity * RISK_CONFIG.max_risk_per_trade
         
         # 3. Modify Risk by Strategy Conviction Factor
-        if "STRICT" in reason:
+        if kind == StrategyKind.STRICT_SCALP:
             conviction_multiplier = 1.0
-        elif "LOOSE" in reason:
+        elif kind == StrategyKind.LOOSE_SCALP:
             conviction_multiplier = 0.5
         else:
             conviction_multiplier = 0.75
         
         # 4. Apply Regime-Based Weight Adjustment
-        regime_weights = SYSTEM_STATE.get("regime_weights", {})
-        regime = SYSTEM_STATE.get("regime", "RANGING")
-        
-        momentum_weight = regime_weights.get("Momentum", 1.0)
-        mean_reversion_weight = regime_weights.get("MeanReversion", 1.0)
-        
-        if regime == "BULL_TREND" and side == "BUY":
-            regime_multiplier = momentum_weight
-        elif regime == "BEAR_TREND" and side == "SELL":
-            regime_multiplier = momentum_weight
-        elif regime == "RANGING":
-            regime_multiplier = mean_reversion_weight
-        elif regime == "HIGH_VOLATILITY":
-            regime_multiplier = 0.7
-        elif regime == "COMPRESSED":
-            regime_multiplier = 1.2
-        else:
-            regime_multiplier = 1.0
+        regime_multiplier = compute_regime_mult(regime, side, regime_weights)
         
         adjusted_max_loss_usdt = base_risk_amount * conviction_multiplier * regime_multiplier
         
@@ -303,56 +329,61 @@ class ScalperEngine:
         
         if result["status"] == "FILLED":
             session = DB_SESSION()
-            # Generate Unique Trade Code
-            trade_count = session.query(Trade).filter(Trade.symbol == symbol).count()
-            side_code = "L" if side.upper() == "BUY" else "S"
-            trade_code = f"{symbol.split('USDT')[0]}-{side_code}-{trade_count+1:02d}"
+            try:
+                # Generate Unique Trade Code
+                trade_count = session.query(Trade).filter(Trade.symbol == symbol).count()
+                side_code = "L" if side.upper() == "BUY" else "S"
+                trade_code = f"{symbol.split('USDT')[0]}-{side_code}-{trade_count+1:02d}"
 
-            new_trade = Trade(
-                symbol=symbol, side=side, amount=amount, entry_price=price,
-                entry_time=datetime.utcnow(), status="OPEN", order_id=result["order_id"],
-                strategy=reason, leverage=leverage, trade_code=trade_code,
-                market_context=context
-            )
-            session.add(new_trade)
-            session.commit()
-            
-            conviction = "95%" if "STRICT" in reason else ("70%" if "LOOSE" in reason else "85%")
-            risk = "LOW" if "STRICT" in reason else ("MED" if "LOOSE" in reason else "HIGH")
+                new_trade = Trade(
+                    symbol=symbol, side=side, amount=amount, entry_price=price,
+                    entry_time=ts_ms(), status="OPEN", order_id=result["order_id"],
+                    strategy=reason, leverage=leverage, trade_code=trade_code,
+                    market_context=context
+                )
+                session.add(new_trade)
+                session.commit()
             
-            ACTIVE_TRADES.append({
-                "id": new_trade.id, 
-                "trade_code": trade_code,
-                "time": new_trade.entry_time.timestamp(),
-                "symbol": symbol, 
-                "type": f"{side} ({reason.split('_')[0]})", 
-                "status": "OPEN",
-                "pnl": "$0.00", 
-                "cost": f"${(amount * price):.2f}",
-                "entry_price": price,
-                "amount": amount,
-                "order_id": new_trade.order_id, 
-                "reason": reason,
-                "conviction": conviction, 
-                "risk": risk, 
-                "leverage": leverage
-            })
+                conviction = "95%" if kind == StrategyKind.STRICT_SCALP else ("70%" if kind == StrategyKind.LOOSE_SCALP else "85%")
+                risk = "LOW" if kind == StrategyKind.STRICT_SCALP else ("MED" if kind == StrategyKind.LOOSE_SCALP else "HIGH")
             
-            log_msg = f"SCALPER: Entering {side} for {symbol} at ${price} via {reason}"
-            LOG_HISTORY.append({"time": time.time(), "msg": log_msg})
+                add_active_trade(ActiveTrade(
+                    id=new_trade.id,
+                    trade_code=trade_code,
+                    time=new_trade.entry_time / 1000,
+                    symbol=symbol,
+                    side=side,
+                    type=f"{side} ({reason.split('_')[0]})",
+                    status="OPEN",
+                    pnl="$0.00",
+                    cost=f"${(amount * price):.2f}",
+                    entry_price=price,
+                    amount=amount,
+                    order_id=new_trade.order_id,
+                    reason=reason,
+                    kind=kind,
+                    conviction=conviction,
+                    risk=risk,
+                    leverage=leverage
+                ))
+                track_scalp(symbol, kind)
             
-            # Specialized Trade Log for Intelligence
-            TRADE_LOG_HISTORY.append({
-                "timestamp": time.time(),
-                "action": "ENTRY",
-                "symbol": symbol,
-                "type": side,
-                "price": price,
-                "amount": amount,
-                "leverage": leverage,
-                "amount_usd": position_size_usdt,
-                "reason": reason
-            })
+                log_msg = f"SCALPER: Entering {side} for {symbol} at ${price} via {reason}"
+                log_event(log_msg)
             
-            session.close()
+                # Specialized Trade Log for Intelligence
+                TRADE_LOG_HISTORY.append({
+                    "timestamp": time.time(),
+                    "action": "ENTRY",
+                    "symbol": symbol,
+                    "type": side,
+                    "price": price,
+                    "amount": amount,
+                    "leverage": leverage,
+                    "amount_usd": position_size_usdt,
+                    "reason": reason
+                })
+            finally:
+                session.close()
+
             logger.success(f"[Scalper] Position Live: {symbol} {side} ${price} [{reason}]")
@@ -0,0 +1,31 @@
+from enum import IntEnum
+
+class StrategyKind(IntEnum):
+    """
+    Trade category, set once when a trade is created.
+    `reason` stays a display string; control flow branches on the kind.
+    """
+    MANUAL = 0
+    STRICT_SCALP = 1
+    LOOSE_SCALP = 2
+    RECON_SYNC = 3
+    STRATEGIC_BRIDGE = 4
+
+    @classmethod
+    def from_reason(cls, reason: str) -> "StrategyKind":
+        """Maps a legacy reason/strategy string (e.g. from the DB) to its kind."""
+        reason = (reason or "").upper()
+        if "STRICT" in reason:
+            return cls.STRICT_SCALP
+        if "LOOSE" in reason:
+            return cls.LOOSE_SCALP
+        if "RECON" in reason:
+            return cls.RECON_SYNC
+        if "STRATEGIC" in reason:
+            return cls.STRATEGIC_BRIDGE
+        return cls.MANUAL
+
+# Kinds with TP/SL managed by the scalper
+SCALP_KINDS = frozenset({StrategyKind.STRICT_SCALP, StrategyKind.LOOSE_SCALP})
+# Kinds counted towards the one-sub-trade-per-symbol rule
+SCALPER_KINDS = SCALP_KINDS | {StrategyKind.RECON_SYNC}
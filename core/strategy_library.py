@@ -6,22 +6,30 @@ class StrategyLibrary:
     """
     Mirroring technical indicators from indicators.ts
     Ensures deterministic math controls execution.
+    Inputs are computed in float32: ample for price precision, half the memory traffic.
     """
+
+    @staticmethod
+    def _as_f32(data) -> np.ndarray:
+        return np.ascontiguousarray(data, dtype=np.float32)
     
     @staticmethod
     def calculate_sma(data: np.ndarray, period: int) -> np.ndarray:
+        data = StrategyLibrary._as_f32(data)
         if len(data) < period:
-            return np.full(len(data), np.nan)
+            return np.full(len(data), np.nan, dtype=np.float32)
         return pd.Series(data).rolling(window=period).mean().values
 
     @staticmethod
     def calculate_ema(data: np.ndarray, period: int) -> np.ndarray:
+        data = StrategyLibrary._as_f32(data)
         if len(data) == 0:
-            return np.array([])
+            return np.array([], dtype=np.float32)
         return pd.Series(data).ewm(span=period, adjust=False).mean().values
 
     @staticmethod
     def calculate_bollinger_bands(data: np.ndarray, period: int, std_dev: float) -> Dict[str, np.ndarray]:
+        data = StrategyLibrary._as_f32(data)
         middle = StrategyLibrary.calculate_sma(data, period)
         std = pd.Series(data).rolling(window=period).std(ddof=0).values
         upper = middle + (std * std_dev)
@@ -36,13 +44,14 @@ class StrategyLibrary:
 
     @staticmethod
     def calculate_atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> np.ndarray:
+        high, low, close = (StrategyLibrary._as_f32(a) for a in (high, low, close))
         tr1 = high - low
         tr2 = np.abs(high - np.roll(close, 1))
         tr3 = np.abs(low - np.roll(close, 1))
         tr = np.maximum(tr1, np.maximum(tr2, tr3))
         tr[0] = high[0] - low[0] # Handle first entry
         
-        atr = np.full(len(tr), np.nan)
+        atr = np.full(len(tr), np.nan, dtype=np.float32)
         if len(tr) >= period:
             # First ATR is simple average
             atr[period-1] = np.mean(tr[:period])
@@ -53,13 +62,14 @@ class StrategyLibrary:
 
     @staticmethod
     def calculate_rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+        close = StrategyLibrary._as_f32(close)
         delta = np.diff(close)
-        gain = np.where(delta > 0, delta, 0)
-        loss = np.where(delta < 0, -delta, 0)
+        gain = np.where(delta > 0, delta, np.float32(0))
+        loss = np.where(delta < 0, -delta, np.float32(0))
         
-        avg_gain = np.full(len(close), np.nan)
-        avg_loss = np.full(len(close), np.nan)
-        rsi = np.full(len(close), np.nan)
+        avg_gain = np.full(len(close), np.nan, dtype=np.float32)
+        avg_loss = np.full(len(close), np.nan, dtype=np.float32)
+        rsi = np.full(len(close), np.nan, dtype=np.float32)
         
         if len(close) <= period:
             return rsi
@@ -81,8 +91,9 @@ class StrategyLibrary:
         Calculates Stochastic Oscillator (%K, %D).
         Standard scalping settings: 9, 3, 3 or 5, 3, 3.
         """
+        high, low, close = (StrategyLibrary._as_f32(a) for a in (high, low, close))
         if len(close) < k_period:
-            return {"k": np.full(len(close), np.nan), "d": np.full(len(close), np.nan)}
+            return {"k": np.full(len(close), np.nan, dtype=np.float32), "d": np.full(len(close), np.nan, dtype=np.float32)}
             
         # Lowest Low and Highest High over k_period
         low_min = pd.Series(low).rolling(window=k_period).min()
@@ -1,73 +1,167 @@
-import ccxt
-import pandas as pd
-import time
+import asyncio
+import math
+import os
+import ccxt.async_support as ccxt
+import numpy as np
+import polars as pl
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Sequence, Tuple
 from loguru import logger
 from config.settings import SETTINGS
 
+# Homogeneous numeric schema so OHLC(V) selections export to NumPy without boxing
+OHLCV_SCHEMA = {
+    'timestamp': pl.Int64,
+    'open': pl.Float64,
+    'high': pl.Float64,
+    'low': pl.Float64,
+    'close': pl.Float64,
+    'volume': pl.Float64,
+}
+
+# On-disk candle cache, one Parquet file per (exchange, symbol, timeframe)
+CACHE_DIR = ".cache"
+
 class DataLoader:
     """
     Handles historical and incremental data loading using CCXT.
     Ensures data integrity and continuity.
     """
     
-    def __init__(self, exchange_id: str = "binance"):
+    def __init__(self, exchange_id: str = "binance", max_concurrency: int = 8):
+        self.exchange_id = exchange_id
         self.exchange_class = getattr(ccxt, exchange_id)
+        # Async client: CCXT's enableRateLimit throttles concurrent page requests for us
         self.exchange = self.exchange_class({
             'enableRateLimit': True,
             'options': {'defaultType': 'future'}
         })
+        self.max_concurrency = max_concurrency
         logger.info(f"DataLoader initialized with {exchange_id}")
 
-    def fetch_historical_candles(
+    async def fetch_historical_candles(
         self, 
         symbol: str, 
         timeframe: str, 
         since: Optional[int] = None, 
         limit: int = 1000
-    ) -> pd.DataFrame:
+    ) -> pl.DataFrame:
         """
-        Fetches historical klines and returns a cleaned DataFrame.
+        Fetches historical klines and returns a cleaned Polars DataFrame.
+        Timestamps are kept as epoch milliseconds (Int64), matching CCXT.
         """
         logger.info(f"Fetching historical data for {symbol} ({timeframe})")
         
-        all_candles = []
-        current_since = since
+        cache_path = self._cache_path(symbol, timeframe)
+        cached = self._load_cache(cache_path)
         
-        while True:
-            try:
-                candles = self.exchange.fetch_ohlcv(symbol, timeframe, since=current_since, limit=limit)
-                if not candles:
-                    break
-                
-                all_candles.extend(candles)
-                last_time = candles[-1][0]
-                
-                # Update since for next batch
-                if len(candles) < limit:
-                    break
-                
-                current_since = last_time + 1
-                time.sleep(self.exchange.rateLimit / 1000) # Respect rate limits
-                
-            except Exception as e:
-                logger.error(f"Error fetching candles: {e}")
-                break
+        if cached is not None and (since is None or cached['timestamp'].min() <= since):
+            # Older bars are immutable; only the newest one expires, after one timeframe
+            last_ts = cached['timestamp'].max()
+            tf_ms = self.exchange.parse_timeframe(timeframe) * 1000
+            if self.exchange.milliseconds() - last_ts < tf_ms:
+                candles, complete = [], True
+            else:
+                candles, complete = await self._fetch_range(symbol, timeframe, last_ts, limit)
+        else:
+            candles, complete = await self._fetch_range(symbol, timeframe, since, limit)
+        
+        fresh = pl.DataFrame(candles, schema=OHLCV_SCHEMA, orient='row')
+        if cached is None:
+            merged = fresh.unique(subset='timestamp', keep='first', maintain_order=True)
+        else:
+            # Re-fetched bars win over cached ones (the newest cached bar may have been still forming)
+            merged = pl.concat([cached, fresh]).unique(subset='timestamp', keep='last').sort('timestamp')
+        
+        # A failed page would leave a hole the cache never refetches: only persist complete ranges
+        if not fresh.is_empty() and complete:
+            self._write_cache(cache_path, merged)
+        elif not complete:
+            logger.warning(f"Not caching {symbol} ({timeframe}): some pages failed and will be refetched next time")
         
-        df = pd.DataFrame(all_candles, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        df = merged.filter(pl.col('timestamp') >= since) if since is not None else merged.tail(limit)
         
         # Validation: check for gaps
         self.validate_continuity(df, timeframe)
         
         return df
 
-    def validate_continuity(self, df: pd.DataFrame, timeframe: str):
+    async def _fetch_range(self, symbol: str, timeframe: str, since: Optional[int], limit: int) -> Tuple[list, bool]:
+        """
+        Fetches all klines from `since` up to now (or a single latest page when `since` is None).
+        Returns (candles, complete); complete is False if any page failed (its candles are missing).
+        """
+        if since is None:
+            # No start point: a single page of the most recent candles
+            try:
+                return await self._fetch_page(symbol, timeframe, None, limit), True
+            except Exception as e:
+                logger.error(f"Error fetching candles: {e}")
+                return [], False
+        
+        # Known range: compute every page start up-front and fetch them concurrently
+        page_ms = self.exchange.parse_timeframe(timeframe) * 1000 * limit
+        n_pages = max(1, math.ceil((self.exchange.milliseconds() - since) / page_ms))
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def bounded(page_since: int):
+            async with semaphore:
+                return await self._fetch_page(symbol, timeframe, page_since, limit)
+
+        # gather() preserves page order, so the flattened list is already chronological
+        pages = await asyncio.gather(*(bounded(since + i * page_ms) for i in range(n_pages)), return_exceptions=True)
+        return self._collect_pages(pages)
+
+    @staticmethod
+    def _collect_pages(pages: list) -> Tuple[list, bool]:
+        failed = [p for p in pages if isinstance(p, Exception)]
+        for e in failed:
+            logger.error(f"Error fetching candles: {e}")
+        return [candle for page in pages if not isinstance(page, Exception) for candle in page], not failed
+
+    def _cache_path(self, symbol: str, timeframe: str) -> str:
+        safe_symbol = symbol.replace('/', '_').replace(':', '_')
+        return os.path.join(CACHE_DIR, f"{self.exchange_id}_{safe_symbol}_{timeframe}.parquet")
+
+    def _load_cache(self, cache_path: str) -> Optional[pl.DataFrame]:
+        """Returns the cached candles, or None on a miss or unreadable file."""
+        if not os.path.exists(cache_path):
+            return None
+        try:
+            cached = pl.read_parquet(cache_path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable candle cache {cache_path}: {e}")
+            return None
+        return None if cached.is_empty() else cached
+
+    def _write_cache(self, cache_path: str, df: pl.DataFrame):
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            df.write_parquet(cache_path)
+        except Exception as e:
+            logger.warning(f"Failed to write candle cache {cache_path}: {e}")
+
+    async def _fetch_page(self, symbol: str, timeframe: str, since: Optional[int], limit: int) -> list:
+        """Fetches one page of klines (errors propagate to _fetch_range)."""
+        return await self.exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=limit)
+
+    async def close(self):
+        """Releases the async exchange session."""
+        await self.exchange.close()
+
+    @staticmethod
+    def to_numpy(df: pl.DataFrame, columns: Sequence[str] = ('high', 'low', 'close'), dtype=np.float32) -> np.ndarray:
+        """
+        Column-major NumPy view of the selected numeric columns for indicator kernels.
+        Defaults to float32, which is what StrategyLibrary computes in.
+        """
+        return df.select(pl.col(list(columns)).cast(pl.Float32 if dtype == np.float32 else pl.Float64)).to_numpy(order='fortran')
+
+    def validate_continuity(self, df: pl.DataFrame, timeframe: str):
         """
         Checks if the data has any missing candles based on the timeframe.
         """
-        if df.empty:
+        if df.is_empty():
             return
             
         # Implementation of gap detection logic...
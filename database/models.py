@@ -1,11 +1,16 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, ForeignKey, JSON
+import time
+from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, JSON, Index, delete
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from datetime import datetime
 from config.settings import SETTINGS
 
 Base = declarative_base()
 
+def ts_ms() -> int:
+    """Current UNIX time in milliseconds, the storage format for every timestamp column."""
+    return int(time.time() * 1000)
+
 class Trade(Base):
     __tablename__ = 'trades'
     
@@ -21,27 +26,75 @@ class Trade(Base):
     pnl_pct = Column(Float, default=0.0)
     regime = Column(String)
     strategy = Column(String)
-    entry_time = Column(DateTime, default=datetime.utcnow)
-    exit_time = Column(DateTime)
+    entry_time = Column(Integer, default=ts_ms) # UNIX ms
+    exit_time = Column(Integer) # UNIX ms
     order_id = Column(String)
     trade_code = Column(String)
     memo = Column(String) # AI-generated trade justification
     market_context = Column(JSON) # Snapshot of L2 walls, RSI, Trend, etc.
 
+    __table_args__ = (
+        # Open-positions lookup and the status route's per-symbol CLOSED / exit_time >= cutoff aggregates
+        Index('ix_trade_symbol_status_exit', 'symbol', 'status', 'exit_time'),
+        # Boot-time load of every OPEN trade, and the recon route's CLOSED + exit_time range
+        Index('ix_trade_status_exit', 'status', 'exit_time'),
+        Index('ix_trade_order_id', 'order_id'), # close_trade / scalper exits look trades up by order id
+        Index('ix_trade_entry_time', 'entry_time'),
+    )
+
+def has_open_trade(session, symbol: str, strategy: str = None) -> bool:
+    """
+    SELECT EXISTS(...) over ix_trade_symbol_status_exit: SQLite stops at the first
+    match instead of materializing a Trade row.
+    """
+    query = session.query(Trade.id).filter(Trade.symbol == symbol, Trade.status == 'OPEN')
+    if strategy is not None:
+        query = query.filter(Trade.strategy == strategy)
+    return session.query(query.exists()).scalar()
+
 class CandleCache(Base):
     """Local cache for high-speed signal calculation."""
     __tablename__ = 'candle_cache'
     
     id = Column(Integer, primary_key=True)
-    symbol = Column(String, index=True)
-    timeframe = Column(String, index=True)
-    timestamp = Column(DateTime, index=True)
+    symbol = Column(String)
+    timeframe = Column(String)
+    timestamp = Column(Integer) # UNIX ms, as returned by ccxt
     open = Column(Float)
     high = Column(Float)
     low = Column(Float)
     close = Column(Float)
     volume = Column(Float)
 
+# Reads filter on (symbol, timeframe) and take the newest N: one range scan.
+# Unique, so it doubles as the upsert conflict target.
+Index('ix_candle_lookup', CandleCache.symbol, CandleCache.timeframe, CandleCache.timestamp.desc(), unique=True)
+
+CANDLE_RETENTION_DAYS = 30 # covers the recon history window; older candles are never read
+
+def bulk_upsert_candles(session, rows: list, retention_days: int = CANDLE_RETENTION_DAYS):
+    """
+    Upserts candle dicts (symbol, timeframe, timestamp, open..volume) in one statement and
+    transaction, pruning each written series to its last `retention_days` in the same transaction.
+    """
+    if not rows:
+        return
+    stmt = sqlite_insert(CandleCache).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['symbol', 'timeframe', 'timestamp'],
+        set_={col: stmt.excluded[col] for col in ('open', 'high', 'low', 'close', 'volume')}
+    )
+    cutoff = ts_ms() - retention_days * 86_400_000
+    with session.begin():
+        session.execute(stmt)
+        # Per-series deletes: (symbol, timeframe, timestamp < cutoff) is an ix_candle_lookup range
+        for symbol, timeframe in {(r["symbol"], r["timeframe"]) for r in rows}:
+            session.execute(delete(CandleCache).where(
+                CandleCache.symbol == symbol,
+                CandleCache.timeframe == timeframe,
+                CandleCache.timestamp < cutoff
+            ))
+
 class StrategyPerformance(Base):
     """Long-term memory for AI Meta Review."""
     __tablename__ = 'strategy_performance'
@@ -52,13 +105,67 @@ class StrategyPerformance(Base):
     win_rate = Column(Float)
     total_trades = Column(Integer)
     avg_pnl = Column(Float)
-    last_updated = Column(DateTime, default=datetime.utcnow)
+    last_updated = Column(Integer, default=ts_ms)
+
+# Timestamp columns migrated from DateTime text to UNIX ms
+_MS_COLUMNS = (
+    ('trades', 'entry_time'), ('trades', 'exit_time'),
+    ('candle_cache', 'timestamp'), ('strategy_performance', 'last_updated'),
+)
+# Indexes replaced by a wider one sharing their prefix (or, for the legacy single-column
+# candle_cache indexes from index=True, by ix_candle_lookup); dropped from existing databases
+_SUPERSEDED_INDEXES = (
+    'ix_trade_symbol_status', 'ix_trade_status',
+    'ix_candle_cache_symbol', 'ix_candle_cache_timeframe', 'ix_candle_cache_timestamp',
+)
+# Tables no longer backed by a model (candle_cache_columnar had no reader)
+_DROPPED_TABLES = ('candle_cache_columnar',)
 
 # Database initialization helper
 def init_db():
-    from sqlalchemy import create_engine
+    from sqlalchemy import create_engine, event, text
     engine = create_engine(f"sqlite:///{SETTINGS.DB_PATH}")
+
+    @event.listens_for(engine, "connect")
+    def _sqlite_pragmas(dbapi_con, _):
+        # WAL + relaxed fsync: readers never block on the scheduler's writes
+        cur = dbapi_con.cursor()
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA synchronous=NORMAL")
+        cur.execute("PRAGMA temp_store=MEMORY")
+        cur.execute("PRAGMA cache_size=-64000") # ~64 MB page cache
+        cur.execute("PRAGMA mmap_size=30000000000") # capped by SQLite's compile-time limit
+        cur.close()
+
     Base.metadata.create_all(engine)
+    # Databases created before the switch to integer timestamps hold ISO text; convert in place
+    with engine.begin() as conn:
+        for table, column in _MS_COLUMNS:
+            conn.execute(text(
+                f"UPDATE {table} SET {column} = CAST(ROUND((julianday({column}) - 2440587.5) * 86400000) AS INTEGER) "
+                f"WHERE typeof({column}) = 'text'"
+            ))
+    # create_all() skips indexes on tables that already exist; add any missing ones
+    # and drop ones superseded by a wider composite (a prefix index only costs writes)
+    with engine.begin() as conn:
+        for name in _SUPERSEDED_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        for name in _DROPPED_TABLES:
+            conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
     return sessionmaker(bind=engine)
 
 DB_SESSION = init_db()
+
+async def get_db():
+    """
+    FastAPI dependency: one session per request, closed when the response is done.
+    Async so it opens/closes on the event-loop thread the async routes query from.
+    """
+    session = DB_SESSION()
+    try:
+        yield session
+    finally:
+        session.close()
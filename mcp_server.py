@@ -23,7 +23,7 @@ async def get_bot_status():
 
 async def get_market_data(symbol: str):
     """Fetches real-time price and technical context for a specific symbol."""
-    bridge = ExchangeHandler()
+    bridge = ExchangeHandler.shared()
     client = await bridge._get_client(force_public=True)
     ticker = await client.fetch_ticker(symbol)
     return {
@@ -72,7 +72,7 @@ async def main():
                     params.get("amount")
                 )
             elif method == "read_logs":
-                result = LOG_HISTORY[-10:] if LOG_HISTORY else [{"msg": "No logs available"}]
+                result = list(LOG_HISTORY)[-10:] if LOG_HISTORY else [{"msg": "No logs available"}]
             else:
                 result = {"error": "Method not found"}
                 
@@ -1,4 +1,4 @@
-import pandas as pd
+import asyncio
 import numpy as np
 import time
 from loguru import logger
@@ -6,7 +6,7 @@ from data.data_loader import DataLoader
 from core.regime_engine import RegimeEngine
 from core.strategy_library import StrategyLibrary
 
-def run_initial_load_and_test():
+async def run_initial_load_and_test():
     """
     1. Fetches rich historical BTC data across various regimes.
     2. Runs analysis to verify 'The Brain' is working.
@@ -18,8 +18,8 @@ def run_initial_load_and_test():
     
     # 1. Fetch 1000 candles of 1h data for a broad view
     try:
-        df = loader.fetch_historical_candles("BTC/USDT", "1h", limit=1000)
-        if df.empty:
+        df = await loader.fetch_historical_candles("BTC/USDT", "1h", limit=1000)
+        if df.is_empty():
             logger.error("Failed to fetch data. Check internet/API.")
             return
         
@@ -28,7 +28,7 @@ def run_initial_load_and_test():
         logger.info(f"Analysis Complete. Current Market Regime: {current_regime}")
         
         # 3. Calculate Meta Signals (Indicators)
-        close = df['close'].values
+        close = df['close'].to_numpy()
         ema20 = StrategyLibrary.calculate_ema(close, 20)
         ema50 = StrategyLibrary.calculate_ema(close, 50)
         rsi = StrategyLibrary.calculate_rsi(close, 14)
@@ -46,14 +46,17 @@ def run_initial_load_and_test():
         }
         
         # (Writing to data/processed for persistence)
-        df.to_csv("data/processed/btc_initial_data.csv")
-        logger.info("Initial dataset saved to data/processed/btc_initial_data.csv")
+        # Columnar + zstd: downstream indicator loads can read just the columns they need
+        df.write_parquet("data/processed/btc_initial_data.parquet", compression="zstd")
+        logger.info("Initial dataset saved to data/processed/btc_initial_data.parquet")
         
         return metadata
 
     except Exception as e:
         logger.error(f"Error in initial load: {e}")
         return None
+    finally:
+        await loader.close()
 
 if __name__ == "__main__":
-    run_initial_load_and_test()
+    asyncio.run(run_initial_load_and_test())
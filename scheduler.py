@@ -3,42 +3,126 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from loguru import logger
 
 import time
-import pandas as pd
+import numpy as np
+from datetime import datetime
 from core.scalper_engine import ScalperEngine
-from core.strategy_library import StrategyLibrary
+from core.indicator_kernels import StreamingRSI, warmup as warmup_kernels
+from core.exchange_handler import ExchangeHandler, close_exchange_clients
+from core.executor import StrategicBridge
+from core.regime_engine import RegimeEngine
 from config.settings import SETTINGS
+from database.models import DB_SESSION, bulk_upsert_candles
+from web_ui.state import SYSTEM_STATE, RECON_HISTORY, log_event
 
 # Initialize Scalper
 SCALPER = ScalperEngine()
 
+# Long-lived exchange bridge shared by every cycle (keeps the client session warm)
+EXCHANGE = None
+
+async def get_exchange():
+    global EXCHANGE
+    if EXCHANGE is None:
+        EXCHANGE = ExchangeHandler()
+    return EXCHANGE
+
+# Per-symbol 15m RSI state carried between cycles
+STREAMING_RSI = {symbol: StreamingRSI(14) for symbol in SETTINGS.WATCHLIST}
+_TF_15M_MS = 15 * 60 * 1000
+# Concurrent exchange requests per watchlist sweep
+_FETCH_CONCURRENCY = 8
+
+async def _compute_rsi(client, symbol):
+    """
+    15m RSI, last price and the fetched bars for `symbol`. Once warm, only the latest
+    closed and forming candles are fetched; a cold start (or missed candles) re-seeds from 30 bars.
+    """
+    rsi_state = STREAMING_RSI.setdefault(symbol, StreamingRSI(14))
+    
+    if rsi_state.warm:
+        ohlcv = await client.fetch_ohlcv(symbol, "15m", limit=2)
+        closed_ts, closed_close = ohlcv[-2][0], ohlcv[-2][4]
+        if closed_ts == rsi_state.last_ts + _TF_15M_MS:
+            rsi_state.update(closed_ts, closed_close)
+        elif closed_ts != rsi_state.last_ts:
+            rsi_state.reset()
+    
+    if not rsi_state.warm:
+        ohlcv = await client.fetch_ohlcv(symbol, "15m", limit=30)
+        closed = np.asarray(ohlcv[:-1], dtype=np.float64).reshape(-1, 6)
+        if not rsi_state.seed(closed[:, 0], closed[:, 4]):
+            return float("nan"), ohlcv[-1][4], ohlcv
+    
+    # The forming candle counts towards the displayed RSI but is not committed
+    price = ohlcv[-1][4]
+    return rsi_state.peek(price), price, ohlcv
+
+def classify_rsi_regime(rsi):
+    """RSI fallback regime (>60 bull, <40 bear, else ranging) for a scalar or an array of RSIs."""
+    return np.select([np.greater(rsi, 60), np.less(rsi, 40)], ["BULL_TREND", "BEAR_TREND"], default="RANGING")
+
+def _persist_candles(rows):
+    """Upserts one cycle's 15m bars in a single transaction."""
+    session = DB_SESSION()
+    try:
+        bulk_upsert_candles(session, rows)
+    except Exception as e:
+        logger.error(f"Candle cache upsert failed: {e}")
+    finally:
+        session.close()
+
 async def cycle_15m():
     """Background Intelligence Scan for all assets in the Watchlist."""
-    from web_ui.state import SYSTEM_STATE, LOG_HISTORY, RECON_HISTORY
-    from core.exchange_handler import ExchangeHandler
-    
     SYSTEM_STATE["heartbeat"] = "SCANNING_ALL"
     logger.info(f"[Cycle 15m] Comprehensive Watchlist Scan: {len(SETTINGS.WATCHLIST)} assets")
     
-    bridge = ExchangeHandler()
+    try:
+        bridge = await get_exchange()
+        client = await bridge._get_client()
+    except Exception as e:
+        # Publish the failure instead of leaving the heartbeat stuck at SCANNING_ALL
+        logger.error(f"[Cycle 15m] Exchange client unavailable, scan skipped: {e}")
+        SYSTEM_STATE.update({"exchange_connected": False, "heartbeat": "IDLE"})
+        return
+    watchlist = list(SETTINGS.WATCHLIST)
+    default_symbol = SETTINGS.DEFAULT_SYMBOL
+    semaphore = asyncio.Semaphore(_FETCH_CONCURRENCY)
+    
+    async def bounded(symbol):
+        async with semaphore:
+            return await _compute_rsi(client, symbol)
     
-    for symbol in SETTINGS.WATCHLIST:
+    results = await asyncio.gather(*(bounded(s) for s in watchlist), return_exceptions=True)
+    candle_rows = []
+    
+    scanned = []
+    for symbol, result in zip(watchlist, results):
+        if isinstance(result, Exception):
+            logger.error(f"Intelligence Scan Failed for {symbol}: {result}")
+        else:
+            scanned.append((symbol, *result))
+    
+    # Trend labels and recon scores for the whole watchlist in one shot
+    rsis = np.fromiter((item[1] for item in scanned), dtype=np.float64, count=len(scanned))
+    trends = np.where(rsis > 50, "BULLISH", "BEARISH")
+    scores = np.round((rsis - 50) / 50, 2)
+    assets = SYSTEM_STATE.setdefault("assets", {})
+    # This cycle's top-level state, published in one update so readers never see a torn mix
+    snapshot = {}
+    
+    for (symbol, rsi, price, ohlcv), trend, score in zip(scanned, trends, scores):
         try:
-            client = await bridge._get_client()
-            ohlcv = await client.fetch_ohlcv(symbol, "15m", limit=30)
-            df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+            candle_rows.extend({
+                "symbol": symbol, "timeframe": "15m",
+                "timestamp": int(row[0]),
+                "open": row[1], "high": row[2], "low": row[3], "close": row[4], "volume": row[5]
+            } for row in ohlcv)
             
-            rsi_vals = StrategyLibrary.calculate_rsi(df['close'].values, 14)
-            rsi = rsi_vals[-1]
-            price = df['close'].iloc[-1]
-            
-            if symbol == SETTINGS.DEFAULT_SYMBOL:
-                SYSTEM_STATE["rsi"] = rsi
-                SYSTEM_STATE["price"] = price
-                SYSTEM_STATE["exchange_connected"] = True
+            if symbol == default_symbol:
+                snapshot.update(rsi=rsi, price=price, exchange_connected=True)
             
             # Per-asset global tracking
-            if "assets" not in SYSTEM_STATE: SYSTEM_STATE["assets"] = {}
-            SYSTEM_STATE["assets"][symbol] = {
+            assets[symbol] = {
                 "rsi": rsi,
                 "price": price,
                 "last_update": time.time()
@@ -49,10 +133,9 @@ async def cycle_15m():
             RECON_HISTORY.append({
                 "time": report_time,
                 "title": f"AUTO-SCAN: {symbol}",
-                "content": f"Automated background research complete for {symbol}. \nPrice: ${price:.4f} \nRSI: {rsi:.2f} \nTrend: { 'BULLISH' if rsi > 50 else 'BEARISH' }",
-                "score": round((rsi - 50) / 50, 2)
+                "content": f"Automated background research complete for {symbol}. \nPrice: ${price:.4f} \nRSI: {rsi:.2f} \nTrend: {trend}",
+                "score": float(score)
             })
-            if len(RECON_HISTORY) > 50: RECON_HISTORY.pop(0)
             
         except Exception as e:
             logger.error(f"Intelligence Scan Failed for {symbol}: {e}")
@@ -63,27 +146,26 @@ async def cycle_15m():
         if balance is not None:
             # Don't overwrite paper equity with a real $0 testnet balance
             if balance > 0 or SETTINGS.MODE != "paper":
-                SYSTEM_STATE["equity"] = balance
-            SYSTEM_STATE["exchange_connected"] = True
+                snapshot["equity"] = balance
+            snapshot["exchange_connected"] = True
             if balance == 0 and not SETTINGS.BYBIT_API_KEY:
                 logger.warning("Exchange Bridge: Connected in PAPER mode (No API Keys).")
             else:
                 logger.info(f"Exchange Bridge: Connection Verified. Wallet: ${balance}")
         else:
-            SYSTEM_STATE["exchange_connected"] = False
+            snapshot["exchange_connected"] = False
             logger.error("Exchange Bridge: Connection Failed (Balance returned None).")
     except Exception as e:
-        SYSTEM_STATE["exchange_connected"] = False
+        snapshot["exchange_connected"] = False
         logger.error(f"Exchange Bridge: Fatal Connection Error: {e}")
     
-    await bridge.close()
-    SYSTEM_STATE["heartbeat"] = "IDLE"
+    # Blocking SQLite writes run on the default thread pool so the 1m scalper keeps its slot
+    await asyncio.to_thread(_persist_candles, candle_rows)
+    snapshot["heartbeat"] = "IDLE"
+    SYSTEM_STATE.update(snapshot)
 
 async def cycle_1h():
     """Recalculate scores and check trade changes for all watchlist assets."""
-    from web_ui.state import SYSTEM_STATE, LOG_HISTORY
-    from core.executor import StrategicBridge
-    
     SYSTEM_STATE["heartbeat"] = "CHECKING_TRADE"
     logger.info("[Cycle 1h] Running Strategic Bridge analysis for all assets...")
     
@@ -105,46 +187,36 @@ async def cycle_1h():
             success = await bridge.execute_strategic_trade(local_state, decision)
             if success:
                 logger.success(f"[Cycle 1h] Strategic Trade Executed: {symbol} - {decision['reason']}")
-                LOG_HISTORY.append({"time": time.time(), "msg": f"Strategic Logic: {symbol} Trade Executed via {decision['reason']}"})
+                log_event(f"Strategic Logic: {symbol} Trade Executed via {decision['reason']}")
     
-    if len(LOG_HISTORY) > 50: LOG_HISTORY.pop(0)
     SYSTEM_STATE["heartbeat"] = "IDLE"
 
 async def cycle_4h():
     """Update regime state using full RegimeEngine analysis."""
-    from web_ui.state import SYSTEM_STATE, LOG_HISTORY
-    from core.exchange_handler import ExchangeHandler
-    from core.regime_engine import RegimeEngine
-    
     SYSTEM_STATE["heartbeat"] = "REGIME_SCAN"
     logger.info("[Cycle 4h] Running full market regime classification...")
     
     try:
-        bridge = ExchangeHandler()
+        bridge = await get_exchange()
         client = await bridge._get_client()
         ohlcv = await client.fetch_ohlcv(SETTINGS.DEFAULT_SYMBOL, "4h", limit=100)
-        df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-        await bridge.close()
+        # float32 straight away: StrategyLibrary computes in float32 (timestamp column is unused here)
+        bars = np.asarray(ohlcv, dtype=np.float32).reshape(-1, 6)
         
         regime_engine = RegimeEngine()
-        regime = regime_engine.analyze(df)
+        regime = await asyncio.to_thread(regime_engine.analyze_arrays, bars[:, 2], bars[:, 3], bars[:, 4])
         weights = regime_engine.get_regime_weights(regime)
         
         SYSTEM_STATE["regime"] = regime
         SYSTEM_STATE["regime_weights"] = weights
         
-        log_entry = {"time": time.time(), "msg": f"Regime Engine: 4h Analysis complete. Regime: {regime} | Weights: VolExp={weights.get('VolatilityExpansion', 1.0):.1f}, MR={weights.get('MeanReversion', 1.0):.1f}, Mom={weights.get('Momentum', 1.0):.1f}"}
+        log_msg = f"Regime Engine: 4h Analysis complete. Regime: {regime} | Weights: VolExp={weights.get('VolatilityExpansion', 1.0):.1f}, MR={weights.get('MeanReversion', 1.0):.1f}, Mom={weights.get('Momentum', 1.0):.1f}"
     except Exception as e:
         logger.error(f"Regime analysis failed: {e}")
-        if SYSTEM_STATE.get("rsi", 50) > 60:
-            SYSTEM_STATE["regime"] = "BULL_TREND"
-        elif SYSTEM_STATE.get("rsi", 50) < 40:
-            SYSTEM_STATE["regime"] = "BEAR_TREND"
-        else:
-            SYSTEM_STATE["regime"] = "RANGING"
-        log_entry = {"time": time.time(), "msg": f"Regime Engine: Fallback RSI classification. Current: {SYSTEM_STATE['regime']}"}
+        SYSTEM_STATE["regime"] = str(classify_rsi_regime(SYSTEM_STATE.get("rsi", 50)))
+        log_msg = f"Regime Engine: Fallback RSI classification. Current: {SYSTEM_STATE['regime']}"
     
-    LOG_HISTORY.append(log_entry)
+    log_event(log_msg)
     SYSTEM_STATE["heartbeat"] = "IDLE"
 
 async def cycle_scalp_1m():
@@ -156,8 +228,10 @@ async def cycle_daily():
     logger.info("[Cycle Daily] Running walk-forward validation and AI meta-review...")
 
 async def start_scheduler_async():
+    # JIT-compile the numba kernels before the first cycle (off-loop; cached on disk after the first run)
+    await asyncio.to_thread(warmup_kernels)
+    
     scheduler = AsyncIOScheduler()
-    from datetime import datetime
     
     # 15m Cycle (Run immediately)
     scheduler.add_job(cycle_15m, 'interval', minutes=15, next_run_time=datetime.now())
@@ -177,5 +251,10 @@ async def start_scheduler_async():
     scheduler.start()
     logger.info("Async Scheduler started for institutional watchlist cycles.")
     
-    while True:
-        await asyncio.sleep(1000)
+    try:
+        while True:
+            await asyncio.sleep(1000)
+    finally:
+        # Shutdown (task cancelled / KeyboardInterrupt): release the shared exchange sessions
+        scheduler.shutdown(wait=False)
+        await close_exchange_clients()
@@ -1,10 +1,13 @@
 import os
 import asyncio
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import RetryAfter
 from telegram.ext import Application, CommandHandler, CallbackQueryHandler, ContextTypes
 from loguru import logger
 from config.settings import SETTINGS
 
+SEND_RETRIES = 3 # flood-control waits per message before it is dropped
+
 class TelegramBot:
     """
     Interface for system monitoring and manual trade approval.
@@ -14,6 +17,9 @@ class TelegramBot:
         self.token = SETTINGS.TELEGRAM_TOKEN
         self.chat_id = SETTINGS.TELEGRAM_CHAT_ID
         self.application = None
+        # Outgoing messages (send_message kwargs), drained by a single sender task
+        self._outbox = asyncio.Queue()
+        self._drain_task = None
         
         if not self.token:
             logger.warning("Telegram token missing. Bot disabled.")
@@ -34,15 +40,63 @@ class TelegramBot:
         logger.info("Telegram Bot started.")
         await self.application.initialize()
         await self.application.start()
-        await self.application.updater.start_polling()
+        # True long polling: Telegram holds each getUpdates open up to 30s; only the update types we handle are sent
+        await self.application.updater.start_polling(
+            poll_interval=0.0,
+            timeout=30,
+            drop_pending_updates=True,
+            allowed_updates=[Update.MESSAGE, Update.CALLBACK_QUERY]
+        )
+        # Held so the task is not garbage-collected and can be cancelled by stop_bot()
+        self._drain_task = asyncio.create_task(self._drain_outbox())
+
+    async def stop_bot(self):
+        """Drains the outbox (bounded by flush), then stops the sender task and polling."""
+        if not self.application: return
+        await self.flush()
+        if self._drain_task:
+            self._drain_task.cancel()
+        await self.application.updater.stop()
+        await self.application.stop()
+        await self.application.shutdown()
 
-    async def send_alert(self, message: str):
-        """Sends an alert message to the configured chat."""
+    async def _send(self, message: dict):
+        """Sends one message, waiting out Telegram flood control (RetryAfter) up to SEND_RETRIES times."""
+        for _ in range(SEND_RETRIES):
+            try:
+                await self.application.bot.send_message(**message)
+                return
+            except RetryAfter as e:
+                # int seconds in older PTB releases, timedelta in newer ones
+                delay = e.retry_after.total_seconds() if hasattr(e.retry_after, "total_seconds") else float(e.retry_after)
+                logger.warning(f"Telegram flood control: retrying in {delay:.0f}s")
+                await asyncio.sleep(delay)
+            except Exception as e:
+                logger.error(f"Failed to send telegram message: {e}")
+                return
+        logger.error(f"Telegram message dropped after {SEND_RETRIES} flood-control retries.")
+
+    async def _drain_outbox(self):
+        """Single sender: messages go out one at a time in queue order (one chat allows ~1 msg/s)."""
+        while True:
+            message = await self._outbox.get()
+            try:
+                await self._send(message)
+            finally:
+                self._outbox.task_done()
+
+    async def flush(self, timeout: float = 5.0):
+        """Waits (bounded) until queued messages are sent, e.g. before shutdown."""
         if not self.application: return
         try:
-            await self.application.bot.send_message(chat_id=self.chat_id, text=f"⚠️ *ALERT*: {message}", parse_mode='Markdown')
-        except Exception as e:
-            logger.error(f"Failed to send telegram alert: {e}")
+            await asyncio.wait_for(self._outbox.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Telegram outbox not drained within {timeout}s.")
+
+    async def send_alert(self, message: str, silent: bool = False):
+        """Queues an alert for the configured chat; `silent` skips the push notification."""
+        if not self.application: return
+        await self._outbox.put(dict(chat_id=self.chat_id, text=f"⚠️ *ALERT*: {message}", parse_mode='Markdown', disable_notification=silent))
 
     async def request_approval(self, trade_details: dict):
         """Sends an interactive message for trade approval."""
@@ -65,7 +119,7 @@ class TelegramBot:
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
         
-        await self.application.bot.send_message(chat_id=self.chat_id, text=text, reply_markup=reply_markup, parse_mode='Markdown')
+        await self._outbox.put(dict(chat_id=self.chat_id, text=text, reply_markup=reply_markup, parse_mode='Markdown'))
 
     async def status(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("System: ONLINE\nMode: " + SETTINGS.MODE)
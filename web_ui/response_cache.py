@@ -0,0 +1,44 @@
+"""
+Response Cache - Short in-process TTL cache for the dashboard's polled read routes.
+Every open tab polls the same endpoints every few seconds; within the TTL they
+share one computation instead of each re-running the DB queries and ticker fetches.
+"""
+import time
+import asyncio
+import functools
+
+STATUS_TTL = 3.0 # seconds
+TRADES_TTL = 2.0
+
+_CACHE = {} # name -> (computed_at, value)
+_LOCKS = {} # name -> asyncio.Lock, so concurrent misses compute once
+
+def ttl_cached(ttl: float):
+    """
+    Caches a route coroutine's result for `ttl` seconds under the function name.
+    Arguments are NOT part of the key: only use it on routes without query/path
+    parameters (injected dependencies such as the DB session are fine).
+    """
+    def decorator(fn):
+        name = fn.__name__
+        lock = _LOCKS.setdefault(name, asyncio.Lock())
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            hit = _CACHE.get(name)
+            if hit and time.monotonic() - hit[0] < ttl:
+                return hit[1]
+            async with lock:
+                hit = _CACHE.get(name)
+                if hit and time.monotonic() - hit[0] < ttl:
+                    return hit[1]
+                value = await fn(*args, **kwargs)
+                _CACHE[name] = (time.monotonic(), value)
+                return value
+        return wrapper
+    return decorator
+
+def invalidate(*names: str):
+    """Drops cached results (by function name) after a write that changes them."""
+    for name in names:
+        _CACHE.pop(name, None)
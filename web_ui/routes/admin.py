@@ -1,20 +1,26 @@
 """
 Admin Routes - Config, files, git sync, AI toggle, chat, recon, engine triggers.
 """
+import io
 import os
 import re
-import shutil
+import sys
+import bisect
 import time
 import asyncio
-import subprocess
 import httpx
+import aiofiles
+import aiofiles.os
 from typing import Dict
 from fastapi import APIRouter, UploadFile, File
 from loguru import logger
 from pydantic import BaseModel
 from config.settings import SETTINGS
+from sqlalchemy import func
+from core.trade_analyzer import TRADING_AUDITOR
 from database.models import DB_SESSION, Trade, CandleCache
-from web_ui.state import SYSTEM_STATE, LOG_HISTORY, RECON_HISTORY, APPROVAL_QUEUE
+from web_ui.state import SYSTEM_STATE, RECON_HISTORY, enqueue_approval, log_event
+from web_ui.routes.status import refresh_git_info
 from datetime import datetime
 
 router = APIRouter()
@@ -24,37 +30,101 @@ class ChatMessage(BaseModel):
 
 REFERENCE_DIR = "reference_files"
 DATA_DIR = "data/processed"
+FILE_TARGETS = {"reference": REFERENCE_DIR, "data": DATA_DIR} # `target` values the dashboard sends
+UPLOAD_CHUNK = 1024 * 1024 # 1 MiB
+_SENDFILE_TO_FILE = sys.platform.startswith("linux") and hasattr(os, "sendfile")
+SPOOL_MAX_SIZE = 1024 * 1024 # Starlette's MultiPartParser.max_file_size: larger parts are spooled to disk
+
+for _dir in FILE_TARGETS.values():
+    os.makedirs(_dir, exist_ok=True)
+
+# One pooled client for the Intel Service (keeps connections alive across requests); closed on app shutdown
+INTEL_CLIENT = httpx.AsyncClient(
+    base_url="http://intel-service:5000",
+    timeout=httpx.Timeout(5.0, connect=2.0),
+    limits=httpx.Limits(max_keepalive_connections=8)
+)
+
+# Scientist report parsing, compiled once
+_NUM_RE = re.compile(r"[-+]?\d*\.\d+|\d+")
+_SCORE_RE = re.compile(r"(?:Score|Sentiment|Conviction):\s*([-+]?\d*\.?\d+)", re.I)
+_REGIME_RE = re.compile(r"(?:Regime|Condition):\s*(\w+)", re.I)
+_ANALYZE_RE = re.compile(r"(?:analyse|analyze)\s+(\w+)")
 
 # ─── File Management ─────────────────────────────────────────────
 
+def _safe_filename(filename: str):
+    """Returns `filename` if it is a plain, non-hidden name inside one directory, else None."""
+    name = os.path.basename(filename or "")
+    if not name or name != filename or name.startswith("."):
+        return None
+    return name
+
+def _spooled_fd(upload: UploadFile):
+    """The upload's temp-file descriptor when it is already on disk, else None."""
+    # An in-memory spool's fileno() forces a rollover copy, so only ask once the size says it rolled
+    if upload.size is None or upload.size <= SPOOL_MAX_SIZE:
+        return None
+    try:
+        return upload.file.fileno()
+    except (io.UnsupportedOperation, AttributeError):
+        return None
+
+def _sendfile_to(src_fd: int, file_path: str):
+    """Kernel-side copy of a disk-spooled upload into file_path (no user-space buffers)."""
+    size = os.fstat(src_fd).st_size
+    with open(file_path, "wb") as out:
+        offset = 0
+        while offset < size:
+            sent = os.sendfile(out.fileno(), src_fd, offset, size - offset)
+            if not sent:
+                break
+            offset += sent
+
 @router.get("/api/files")
 async def list_files():
-    """List files in reference_files and data/processed."""
-    os.makedirs(REFERENCE_DIR, exist_ok=True)
-    os.makedirs(DATA_DIR, exist_ok=True)
-    return {
-        "reference": os.listdir(REFERENCE_DIR),
-        "processed_data": os.listdir(DATA_DIR)
-    }
+    """List files in reference_files and data/processed (directory scans run off the event loop)."""
+    reference, processed = await asyncio.gather(
+        asyncio.to_thread(os.listdir, REFERENCE_DIR),
+        asyncio.to_thread(os.listdir, DATA_DIR)
+    )
+    return {"reference": reference, "processed_data": processed}
 
 @router.post("/api/files/upload")
 async def upload_file(file: UploadFile = File(...), target: str = "reference"):
-    """Upload a file to the specified target directory."""
-    path = REFERENCE_DIR if target == "reference" else DATA_DIR
-    file_path = os.path.join(path, file.filename)
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-    return {"filename": file.filename, "status": "uploaded"}
+    """Upload a file to the specified target directory, streamed in 1 MiB chunks."""
+    path = FILE_TARGETS.get(target)
+    filename = _safe_filename(file.filename)
+    if path is None or filename is None:
+        return {"status": "error", "message": "Invalid upload target or filename"}
+    file_path = os.path.join(path, filename)
+    # Large bodies are already spooled to a temp file by Starlette: copy fd -> fd with sendfile
+    # (Linux allows a regular file as the target). Small in-memory spools take the chunked path.
+    src_fd = _spooled_fd(file) if _SENDFILE_TO_FILE else None
+    if src_fd is not None:
+        try:
+            await asyncio.to_thread(_sendfile_to, src_fd, file_path)
+            return {"filename": filename, "status": "uploaded"}
+        except OSError as e:
+            logger.debug(f"sendfile upload fell back to chunked copy: {e}")
+            await file.seek(0)
+    async with aiofiles.open(file_path, "wb") as out:
+        while chunk := await file.read(UPLOAD_CHUNK):
+            await out.write(chunk)
+    return {"filename": filename, "status": "uploaded"}
 
 @router.delete("/api/files/{filename}")
 async def delete_file(filename: str, target: str = "reference"):
     """Delete a file from the specified directory."""
-    path = REFERENCE_DIR if target == "reference" else DATA_DIR
-    file_path = os.path.join(path, filename)
-    if os.path.exists(file_path):
-        os.remove(file_path)
-        return {"status": "deleted"}
-    return {"status": "not_found"}
+    path = FILE_TARGETS.get(target)
+    filename = _safe_filename(filename)
+    if path is None or filename is None:
+        return {"status": "error", "message": "Invalid target or filename"}
+    try:
+        await aiofiles.os.remove(os.path.join(path, filename))
+    except FileNotFoundError:
+        return {"status": "not_found"}
+    return {"status": "deleted"}
 
 # ─── Config & Control ────────────────────────────────────────────
 
@@ -65,14 +135,14 @@ async def update_config(data: Dict[str, str]):
         new_symbol = data["symbol"]
         SYSTEM_STATE["symbol"] = new_symbol
         SETTINGS.DEFAULT_SYMBOL = new_symbol
-        LOG_HISTORY.append({"time": time.time(), "msg": f"SYSTEM: Asset switched to {new_symbol}. Re-init scanning..."})
+        log_event(f"SYSTEM: Asset switched to {new_symbol}. Re-init scanning...")
         return {"status": "success", "symbol": new_symbol}
     
     if "timeframe" in data:
         new_tf = data["timeframe"]
         SYSTEM_STATE["timeframe"] = new_tf
         SETTINGS.DEFAULT_TIMEFRAME = new_tf
-        LOG_HISTORY.append({"time": time.time(), "msg": f"SYSTEM: Timeframe switched to {new_tf}. Recalculating indicators..."})
+        log_event(f"SYSTEM: Timeframe switched to {new_tf}. Recalculating indicators...")
         return {"status": "success", "timeframe": new_tf}
     
     if "mode" in data:
@@ -87,7 +157,7 @@ async def update_config(data: Dict[str, str]):
                     SCALPER.executor.setup_exchange()
             except Exception as e:
                 logger.error(f"Failed to propagate mode change: {e}")
-            LOG_HISTORY.append({"time": time.time(), "msg": f"SYSTEM: Execution mode switched to {new_mode}."})
+            log_event(f"SYSTEM: Execution mode switched to {new_mode}.")
             return {"status": "success", "mode": new_mode}
             
     if "strat_toggle" in data:
@@ -96,7 +166,7 @@ async def update_config(data: Dict[str, str]):
             SYSTEM_STATE[strat] = not SYSTEM_STATE.get(strat, False)
             status_str = "ENABLED" if SYSTEM_STATE[strat] else "DISABLED"
             logger.info(f"UI Toggle: Strategy {strat} {status_str}")
-            LOG_HISTORY.append({"time": time.time(), "msg": f"SYSTEM: Strategy {strat.replace('strat_','').upper()} is now {status_str}."})
+            log_event(f"SYSTEM: Strategy {strat.replace('strat_','').upper()} is now {status_str}.")
             return {"status": "success", strat: SYSTEM_STATE[strat]}
     
     return {"status": "error", "message": "Invalid config keys"}
@@ -106,20 +176,29 @@ async def toggle_ai_state():
     """Enables or disables OpenAI calls globally."""
     SYSTEM_STATE["ai_active"] = not SYSTEM_STATE["ai_active"]
     status = "ACTIVE" if SYSTEM_STATE["ai_active"] else "DISABLED"
-    LOG_HISTORY.append({"time": time.time(), "msg": f"SYSTEM: AI Communication has been {status}."})
+    log_event(f"SYSTEM: AI Communication has been {status}.")
     return {"status": "success", "ai_active": SYSTEM_STATE["ai_active"]}
 
+# One shell for the whole sync: stage, commit only if something is staged, push
+GIT_SYNC_SCRIPT = (
+    "git add . && "
+    "{ git diff --cached --quiet || git commit -m 'Sync from DaNoo Web UI'; } && "
+    "git push origin main"
+)
+
 @router.post("/api/system/git_sync")
 async def git_sync():
-    """Pushes local changes to GitHub."""
+    """Pushes local changes to GitHub (asyncio subprocess: a push can take seconds)."""
     try:
-        subprocess.run(["git", "add", "."], check=True)
-        status = subprocess.check_output(["git", "status", "--porcelain"]).decode().strip()
-        if status:
-            subprocess.run(["git", "commit", "-m", "Sync from DaNoo Web UI"], check=True)
-        subprocess.run(["git", "push", "origin", "main"], check=True)
+        proc = await asyncio.create_subprocess_shell(
+            GIT_SYNC_SCRIPT, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        _, err = await proc.communicate()
+        if proc.returncode:
+            return {"status": "error", "message": f"Git Error: {err.decode().strip() or f'exit {proc.returncode}'}"}
+        await asyncio.to_thread(refresh_git_info)
         return {"status": "success", "message": "Pushed to GitHub successfully."}
-    except subprocess.CalledProcessError as e:
+    except OSError as e:
         return {"status": "error", "message": f"Git Error: {str(e)}"}
 
 # ─── Data Collection ─────────────────────────────────────────────
@@ -134,7 +213,7 @@ async def collect_historical_data(payload: dict):
     end_year = int(payload.get("end_year", 2023))
     
     collector = HistoricalDataCollector()
-    LOG_HISTORY.append({"time": time.time(), "msg": f"SYSTEM: Initiated historical data sync for {symbol} ({start_year}-{end_year})..."})
+    log_event(f"SYSTEM: Initiated historical data sync for {symbol} ({start_year}-{end_year})...")
     
     asyncio.create_task(collector.collect_async(symbol, interval, start_year, end_year))
     
@@ -142,51 +221,68 @@ async def collect_historical_data(payload: dict):
 
 # ─── Intelligence & Recon ────────────────────────────────────────
 
+def _local_day(col):
+    """Local calendar day of an epoch-ms column, matching datetime.fromtimestamp()."""
+    return func.date(col / 1000, 'unixepoch', 'localtime')
+
+RECON_TIMEFRAME = "15m" # the timeframe cycle_15m persists into candle_cache
+
+def _recon_aggregates(first_start: int, last_end: int):
+    """Per-day closing candles and per-day closed PnL within [first_start, last_end]."""
+    session = DB_SESSION()
+    try:
+        # Last DEFAULT_SYMBOL 15m candle of every report day (SQLite returns the bare `close` of
+        # the max() row); symbol/timeframe equality plus the timestamp range is an ix_candle_lookup range scan
+        candle_day = _local_day(CandleCache.timestamp)
+        closes = session.query(candle_day, func.max(CandleCache.timestamp), CandleCache.close).filter(
+            CandleCache.symbol == SETTINGS.DEFAULT_SYMBOL,
+            CandleCache.timeframe == RECON_TIMEFRAME,
+            CandleCache.timestamp >= first_start,
+            CandleCache.timestamp <= last_end
+        ).group_by(candle_day).order_by(candle_day).all()
+        
+        exit_day = _local_day(Trade.exit_time)
+        pnl_by_day = dict(session.query(exit_day, func.sum(Trade.pnl)).filter(
+            Trade.status == 'CLOSED',
+            Trade.exit_time >= first_start,
+            Trade.exit_time <= last_end
+        ).group_by(exit_day).all())
+    finally:
+        session.close()
+    return closes, pnl_by_day
+
 @router.get("/api/system/recon")
 async def get_recon_history():
     """Returns the history of intelligence recon reports grouped by date."""
-    from sqlalchemy import desc
-    
-    grouped = {}
-    session = DB_SESSION()
-    
     if not RECON_HISTORY:
-        session.close()
         return {"recon_groups": []}
         
     sorted_recon = sorted(RECON_HISTORY, key=lambda x: x.get('time', 0), reverse=True)
+    days = sorted({datetime.fromtimestamp(item['time']).date() for item in sorted_recon})
+    first_start = int(datetime.combine(days[0], datetime.min.time()).timestamp() * 1000)
+    last_end = int(datetime.combine(days[-1], datetime.max.time()).timestamp() * 1000)
+    
+    closes, pnl_by_day = await asyncio.to_thread(_recon_aggregates, first_start, last_end)
+    close_days = [row[0] for row in closes]
     
+    grouped = {}
     for item in sorted_recon:
         dt = datetime.fromtimestamp(item['time'])
         date_key = dt.strftime("%Y-%m-%d")
         
         if date_key not in grouped:
-            end_of_day = datetime.combine(dt.date(), datetime.max.time())
-            candle = session.query(CandleCache).filter(
-                CandleCache.timestamp <= end_of_day
-            ).order_by(desc(CandleCache.timestamp)).first()
-            closing_price = candle.close if candle else 0.0
-            
-            start_of_day = datetime.combine(dt.date(), datetime.min.time())
-            trades = session.query(Trade).filter(
-                Trade.exit_time >= start_of_day,
-                Trade.exit_time <= end_of_day,
-                Trade.status == 'CLOSED'
-            ).all()
-            daily_pnl = sum((t.pnl or 0.0) for t in trades) if trades else 0.0
-            
+            # Closing price: latest candle at or before the end of that day
+            i = bisect.bisect_right(close_days, date_key) - 1
             grouped[date_key] = {
                 "date": dt.strftime("%b %d, %Y"),
                 "date_id": date_key,
-                "closing_price": closing_price,
-                "daily_pnl": daily_pnl,
+                "closing_price": closes[i][2] if i >= 0 else 0.0,
+                "daily_pnl": pnl_by_day.get(date_key) or 0.0,
                 "items": []
             }
         
         grouped[date_key]["items"].append(item)
     
-    session.close()
-    
     result = []
     sorted_keys = sorted(grouped.keys(), reverse=True)
     for key in sorted_keys:
@@ -201,12 +297,11 @@ async def trigger_recon():
         return {"status": "error", "message": "AI Communication is currently DISABLED. Enable it to run scans."}
         
     try:
-        async with httpx.AsyncClient() as client:
-            await client.post("http://intel-service:5000/api/research/analyze", json={
-                "query": "Manual Institutional Depth Scan: Bitcoin",
-                "context": ""
-            })
-        LOG_HISTORY.append({"time": time.time(), "msg": "Manual Recon: Scientist dispatched for BTC depth scan."})
+        await INTEL_CLIENT.post("/api/research/analyze", json={
+            "query": "Manual Institutional Depth Scan: Bitcoin",
+            "context": ""
+        })
+        log_event("Manual Recon: Scientist dispatched for BTC depth scan.")
         return {"status": "success"}
     except Exception as e:
         return {"status": "error", "message": str(e)}
@@ -215,7 +310,7 @@ async def trigger_recon():
 async def trigger_scan():
     """Manually triggers a fresh regime scan."""
     try:
-        LOG_HISTORY.append({"time": time.time(), "msg": "Manual Command: Depth Market Regime Scan initiated."})
+        log_event("Manual Command: Depth Market Regime Scan initiated.")
         return {"status": "success", "message": "Regime scan triggered."}
     except Exception as e:
         return {"status": "error", "message": str(e)}
@@ -240,15 +335,13 @@ async def chat_with_openclaw(msg: ChatMessage):
             regime_raw = parts[-1].replace("Regime:", "").strip()
             score_raw = parts[-2].replace("Score:", "").strip()
             justification = "|".join(parts[:-2]).replace("Justification:", "").strip()
-            try:
-                score_clean = re.findall(r"[-+]?\d*\.\d+|\d+", score_raw)[0]
-                score = float(score_clean)
-            except: score = 0.0
+            num_match = _NUM_RE.search(score_raw) # first number only: search, not findall
+            if num_match: score = float(num_match.group(0))
         else:
-            score_match = re.search(r"(?:Score|Sentiment|Conviction):\s*([-+]?\d*\.?\d+)", payload, re.I)
+            score_match = _SCORE_RE.search(payload)
             if score_match: score = float(score_match.group(1))
             
-            regime_match = re.search(r"(?:Regime|Condition):\s*(\w+)", payload, re.I)
+            regime_match = _REGIME_RE.search(payload)
             if regime_match: regime_raw = regime_match.group(1).upper()
             
             justification = payload.replace("**High-Level Summary:**", "").strip()
@@ -258,7 +351,7 @@ async def chat_with_openclaw(msg: ChatMessage):
         if regime_raw != "INFO": SYSTEM_STATE["regime"] = regime_raw
         
         report_time = time.time()
-        LOG_HISTORY.append({"time": report_time, "msg": f"AI Intelligence: {justification[:50]}...", "cat": "CORE"})
+        log_event(f"AI Intelligence: {justification[:50]}...", cat="CORE", t=report_time)
         
         RECON_HISTORY.append({
             "time": report_time,
@@ -266,28 +359,25 @@ async def chat_with_openclaw(msg: ChatMessage):
             "content": justification,
             "score": score
         })
-        if len(RECON_HISTORY) > 20: RECON_HISTORY.pop(0)
 
         if abs(score) >= 0.7:
             signal_type = "LONG" if score > 0 else "SHORT"
-            APPROVAL_QUEUE.append({
+            enqueue_approval({
                 "time": time.time(),
                 "signal": f"AI-{signal_type} ({regime_raw})",
                 "sentiment": score,
                 "status": "AWAITING APPROVAL",
                 "reason": justification
             })
-            LOG_HISTORY.append({"time": report_time, "msg": f"STRATEGIC ALERT: High Conviction {signal_type} signal detected. Check Approval Queue."})
+            log_event(f"STRATEGIC ALERT: High Conviction {signal_type} signal detected. Check Approval Queue.", t=report_time)
 
         logger.info(f"Recon Card Created: {regime_raw} | {score}")
         return {"status": "success", "message": "Intelligence Dossier Updated."}
 
     if "analyze" in msg.message.lower() or "analyse" in msg.message.lower():
-        from core.trade_analyzer import TRADING_AUDITOR
-        import re
         
         # Extract asset name (e.g. BTC, ETH, etc)
-        match = re.search(r"(?:analyse|analyze)\s+(\w+)", msg.message.lower())
+        match = _ANALYZE_RE.search(msg.message.lower())
         if match:
             asset = match.group(1).upper()
             report = await TRADING_AUDITOR.analyze_asset(asset)
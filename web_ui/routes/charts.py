@@ -1,86 +1,125 @@
 """
 Chart Routes - OHLCV data, equity history, trade markers.
 """
+import asyncio
+import bisect
+import operator
+import time
+import numpy as np
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import load_only
 from loguru import logger
+from core.exchange_handler import ExchangeHandler
 from database.models import DB_SESSION, Trade
-from web_ui.state import SYSTEM_STATE, EQUITY_HISTORY
+from web_ui.state import SYSTEM_STATE, EQUITY_HISTORY, INTELLIGENCE_FLOW, PREDICTION_STATE
 
 router = APIRouter()
 
+# ─── Shared Exchange Access ──────────────────────────────────────
+OHLCV_TTL = 5.0 # seconds; dashboard polls within this window are served from memory
+_OHLCV_CACHE = {} # (symbol, timeframe) -> (fetched_at, ohlcv)
+_SYMBOL_MAP = {} # dashboard symbol -> ccxt market id, resolved once per process
+PRICES_TTL = 2.0 # seconds
+TICKER_TIMEOUT = 3.0 # seconds; a stalled exchange must not hang the dashboard
+_PRICE_CACHE = {"t": 0.0, "prices": {}} # last good /api/market/prices result
+_OHLCV_INFLIGHT = {} # (symbol, timeframe) -> Task building the /api/chart/ohlcv payload
+_LONG_SIDES = frozenset({"BUY", "LONG"})
+
+async def _fetch_ohlcv_cached(symbol: str, timeframe: str, limit: int = 200):
+    key = (symbol, timeframe)
+    hit = _OHLCV_CACHE.get(key)
+    if hit and time.monotonic() - hit[0] < OHLCV_TTL:
+        return hit[1]
+    # Use Force Public for Mainnet Prices
+    client = await ExchangeHandler.shared()._get_client(force_public=True)
+    ohlcv = await client.fetch_ohlcv(symbol, timeframe, limit=limit)
+    _OHLCV_CACHE[key] = (time.monotonic(), ohlcv)
+    return ohlcv
+
+_CHART_PAYLOAD = {"values": []} # rebuilt only when a new equity point is recorded
+
 @router.get("/api/chart")
 async def get_chart_data():
     """Returns the history of equity for the Performance chart."""
+    global _CHART_PAYLOAD
     if not EQUITY_HISTORY or EQUITY_HISTORY[-1] != SYSTEM_STATE["equity"]:
         EQUITY_HISTORY.append(SYSTEM_STATE["equity"])
+        _CHART_PAYLOAD = {"values": list(EQUITY_HISTORY)}
     
-    history = EQUITY_HISTORY[-50:]
-    return {
-        "labels": [f"T-{len(history)-i-1}" for i in range(len(history))],
-        "values": history
-    }
+    # Labels (T-n .. T-0) are derived client-side from the series length
+    return _CHART_PAYLOAD
 
-@router.get("/api/chart/ohlcv")
+@router.get("/api/chart/ohlcv", response_class=ORJSONResponse)
 async def get_ohlcv_data(symbol: str = "BTCUSDT", timeframe: str = "15m"):
     """Returns OHLCV candles and trade markers for the price chart."""
-    from core.exchange_handler import ExchangeHandler
-    from web_ui.state import INTELLIGENCE_FLOW
-    import time
+    # Single-flight: concurrent identical refreshes share one build (one exchange call, one DB query)
+    key = (symbol, timeframe)
+    task = _OHLCV_INFLIGHT.get(key)
+    if task is None:
+        task = asyncio.create_task(_build_ohlcv_payload(symbol, timeframe))
+        _OHLCV_INFLIGHT[key] = task
+        task.add_done_callback(lambda _: _OHLCV_INFLIGHT.pop(key, None))
+    # shield: one client disconnecting must not cancel the build the others are waiting on
+    return ORJSONResponse(await asyncio.shield(task))
+
+async def _build_ohlcv_payload(symbol: str, timeframe: str) -> dict:
     
     candles = []
     trades = []
     
     try:
-        bridge = ExchangeHandler()
-        # Use Force Public for Mainnet Prices
-        client = await bridge._get_client(force_public=True)
-        ohlcv = await client.fetch_ohlcv(symbol, timeframe, limit=200)
+        ohlcv = await _fetch_ohlcv_cached(symbol, timeframe)
         
-        candles = [{
-            "time": int(row[0] / 1000),
-            "open": row[1],
-            "high": row[2],
-            "low": row[3],
-            "close": row[4],
-        } for row in ohlcv]
+        # One array conversion, then plain Python scalars per column via tolist()
+        arr = np.asarray(ohlcv, dtype=np.float64).reshape(-1, 6)
+        times = (arr[:, 0] // 1000).astype(np.int64).tolist()
+        candles = [
+            {"time": t, "open": o, "high": h, "low": l, "close": c}
+            for t, o, h, l, c in zip(times, *arr[:, 1:5].T.tolist())
+        ]
         
-        session = DB_SESSION()
-        db_trades = session.query(Trade).filter(Trade.symbol == symbol).order_by(Trade.entry_time.desc()).limit(50).all()
+        # Only the columns the markers use; the session is closed even if the query raises
+        with DB_SESSION() as session:
+            db_trades = session.query(Trade).options(load_only(
+                Trade.side, Trade.entry_time, Trade.entry_price, Trade.exit_time, Trade.exit_price, Trade.pnl
+            )).filter(Trade.symbol == symbol).order_by(Trade.entry_time.desc()).limit(50).all()
         
-        candle_times = [c["time"] for c in candles]
+        candle_times = times
         
         def snap_time(t):
+            # candle_times is chronological: the last candle opening at or before t
             if not candle_times: return t
-            valid_times = [ct for ct in candle_times if ct <= t]
-            return max(valid_times) if valid_times else candle_times[0]
+            i = bisect.bisect_right(candle_times, t) - 1
+            return candle_times[i] if i >= 0 else candle_times[0]
         
         for t in db_trades:
-            entry_time = int(t.entry_time.timestamp()) if t.entry_time else None
+            is_long = t.side.upper() in _LONG_SIDES
+            entry_time = t.entry_time // 1000 if t.entry_time else None
             if entry_time:
                 snapped_entry = snap_time(entry_time)
                 marker = {
                     "time": snapped_entry,
-                    "position": "belowBar" if t.side.upper() in ["BUY", "LONG"] else "aboveBar",
-                    "color": "#089981" if t.side.upper() in ["BUY", "LONG"] else "#f23645",
-                    "shape": "arrowUp" if t.side.upper() in ["BUY", "LONG"] else "arrowDown",
+                    "position": "belowBar" if is_long else "aboveBar",
+                    "color": "#089981" if is_long else "#f23645",
+                    "shape": "arrowUp" if is_long else "arrowDown",
                     "text": f"{t.side[:1]} @ {t.entry_price:.2f}" if t.entry_price else t.side,
                 }
                 trades.append(marker)
             
             if t.exit_time and t.exit_price:
-                exit_time = int(t.exit_time.timestamp())
+                exit_time = t.exit_time // 1000
                 snapped_exit = snap_time(exit_time)
                 exit_marker = {
                     "time": snapped_exit,
-                    "position": "aboveBar" if t.side.upper() in ["BUY", "LONG"] else "belowBar",
+                    "position": "aboveBar" if is_long else "belowBar",
                     "color": "#fff" if t.pnl and t.pnl >= 0 else "#f23645",
                     "shape": "circle",
                     "text": f"Exit @ {t.exit_price:.2f}",
                 }
                 trades.append(exit_marker)
         
-        trades.sort(key=lambda x: x["time"])
-        session.close()
+        trades.sort(key=operator.itemgetter("time"))
         
         # Intelligence Logging
         INTELLIGENCE_FLOW.append({
@@ -88,7 +127,6 @@ async def get_ohlcv_data(symbol: str = "BTCUSDT", timeframe: str = "15m"):
             "cat": "CHART",
             "msg": f"Synchronized {len(candles)} candles for {symbol} ({timeframe}). Loaded {len(trades)} trade markers."
         })
-        if len(INTELLIGENCE_FLOW) > 100: INTELLIGENCE_FLOW.pop(0)
         
     except Exception as e:
         logger.error(f"Chart data fetch error: {e}")
@@ -103,47 +141,55 @@ async def get_ohlcv_data(symbol: str = "BTCUSDT", timeframe: str = "15m"):
 @router.get("/api/market/prediction")
 async def get_prediction(symbol: str = "BTCUSDT"):
     """Returns the latest AI forecast for the given symbol."""
-    from web_ui.state import PREDICTION_STATE
     return PREDICTION_STATE.get(symbol, {"status": "Awaiting data..."})
 
 @router.get("/api/market/prices")
 async def get_all_prices():
     """Returns live prices for all supported assets."""
-    from core.exchange_handler import ExchangeHandler
     symbols = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "XRPUSDT", "HBARUSDT", "DOGEUSDT", "XLMUSDT", "XDCUSDT"]
+    if time.monotonic() - _PRICE_CACHE["t"] < PRICES_TTL:
+        return {"prices": _PRICE_CACHE["prices"]}
+    
     prices = {}
     try:
-        bridge = ExchangeHandler()
-        client = await bridge._get_client(force_public=True)
-        markets = await client.load_markets()
+        client = await ExchangeHandler.shared()._get_client(force_public=True)
         
-        # Fuzzy Build symbol map
-        sym_map = {}
-        for s in symbols:
-            # Normalize S for matching
-            norm_s = s.replace("/", "").replace(":", "").upper()
+        if not _SYMBOL_MAP:
+            markets = await client.load_markets()
+            # Fuzzy Build symbol map (normalized market id -> ccxt key)
+            by_norm = {}
             for k in markets.keys():
-                norm_k = k.replace("/", "").replace(":", "").upper()
-                if norm_s == norm_k:
-                    sym_map[s] = k
-                    break
+                by_norm.setdefault(k.replace("/", "").replace(":", "").upper(), k)
+            for s in symbols:
+                norm_s = s.replace("/", "").replace(":", "").upper()
+                if norm_s in by_norm:
+                    _SYMBOL_MAP[s] = by_norm[norm_s]
+        sym_map = _SYMBOL_MAP
             
         target_symbols = list(sym_map.values())
         if not target_symbols:
             return {"prices": {}}
             
         try:
-            tickers = await client.fetch_tickers(target_symbols)
+            tickers = await asyncio.wait_for(client.fetch_tickers(target_symbols), TICKER_TIMEOUT)
             for s, target in sym_map.items():
                 if target in tickers:
                     prices[s] = tickers[target].get("last", 0.0)
+        except asyncio.TimeoutError:
+            logger.warning(f"Multi-price fetch timed out after {TICKER_TIMEOUT}s; serving last known prices.")
+            return {"prices": _PRICE_CACHE["prices"]}
         except Exception as e:
-            for s, target in sym_map.items():
-                try:
-                    t = await client.fetch_ticker(target)
-                    prices[s] = t.get("last", 0.0)
-                except: prices[s] = 0.0
+            # Batch endpoint unsupported/failed: fall back to concurrent single-ticker requests
+            results = await asyncio.gather(
+                *(asyncio.wait_for(client.fetch_ticker(target), TICKER_TIMEOUT) for target in sym_map.values()),
+                return_exceptions=True
+            )
+            for s, t in zip(sym_map, results):
+                prices[s] = 0.0 if isinstance(t, BaseException) else t.get("last", 0.0)
                         
     except Exception as e:
         logger.error(f"FATAL Multi-price fetch error: {str(e)}")
+    
+    if prices:
+        _PRICE_CACHE.update(t=time.monotonic(), prices=prices)
     return {"prices": prices}
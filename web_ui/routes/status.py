@@ -1,36 +1,199 @@
 """
 Status & System Routes - Health, status, system info, reports.
 """
+import os
 import time
+import zlib
+import asyncio
+import orjson
 import psutil
 import platform
 import subprocess
-from fastapi import APIRouter
+import traceback
+from itertools import islice
+from typing import Optional
+from fastapi import APIRouter, Depends, Request, Response
 from loguru import logger
-from web_ui.state import SYSTEM_STATE, LOG_HISTORY, ACTIVE_TRADES
+from sqlalchemy import func, case, and_
+from sqlalchemy.orm import Session
+from config.settings import SETTINGS
+from core.exchange_handler import fetch_last_price
+from database.models import Trade, ts_ms, get_db
+from web_ui.response_cache import ttl_cached, STATUS_TTL
+from web_ui.state import (
+    SYSTEM_STATE, LOG_HISTORY, ACTIVE_TRADES, APPROVAL_QUEUE, ASSET_STATE, LIQUIDITY_STATE, INTELLIGENCE_FLOW,
+    log_event, log_version, log_epoch, clear_logs
+)
 
 router = APIRouter()
 
+# ─── Conditional Responses ───────────────────────────────────────
+# Process-unique prefix so a restart (version counters back at 0) never matches a browser's old ETag
+_BOOT_ID = f"{time.time_ns():x}"
+
+def _conditional_json(request: Request, etag: str, body):
+    """
+    304 if the client already holds `etag`, else the JSON body. `body` may be a
+    zero-arg callable so serialization is skipped entirely on a match.
+    no-cache makes the browser revalidate every poll instead of reusing a stale copy.
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    if callable(body):
+        body = body()
+    return Response(body, media_type="application/json", headers=headers)
+
+def _dumps(obj) -> bytes:
+    return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY, default=str)
+
+# ─── System Probes ───────────────────────────────────────────────
+# In Docker the host's /proc is mounted at /host/proc (docker-compose.yml). psutil ignores
+# the PROCFS_PATH env var; its module attribute must be set before the first probe below.
+HOST_PROCFS = os.environ.get("PROCFS_PATH", "/host/proc")
+if os.path.isdir(HOST_PROCFS):
+    psutil.PROCFS_PATH = HOST_PROCFS
+
+# Prime psutil's CPU counters so cpu_percent(interval=None) reports the delta since the last call
+psutil.cpu_percent(interval=None)
+
+HOST_SAMPLE_INTERVAL = 1.0 # seconds
+_HOST_VITALS = {"cpu_usage": 0.0, "ram_usage": 0.0, "disk_usage": 0.0}
+_HOST_BOOT_TIME = psutil.boot_time() # fixed for the life of the host
+_PLATFORM = platform.system()
+
+def _sample_host():
+    _HOST_VITALS["cpu_usage"] = psutil.cpu_percent(interval=None)
+    _HOST_VITALS["ram_usage"] = psutil.virtual_memory().percent
+    _HOST_VITALS["disk_usage"] = psutil.disk_usage('/').percent
+
+async def host_sampler():
+    """
+    Background task (started by the app lifespan): refreshes _HOST_VITALS every
+    HOST_SAMPLE_INTERVAL, so CPU usage is a steady 1s window whoever polls, and
+    health requests only read a dict.
+    """
+    while True:
+        try:
+            # statvfs/procfs reads can stall on a slow mount (/host/proc in Docker): keep them off the loop
+            await asyncio.to_thread(_sample_host)
+        except Exception as e:
+            logger.warning(f"Host sampler: {e}")
+        await asyncio.sleep(HOST_SAMPLE_INTERVAL)
+
+PROBE_TTL = 5.0 # seconds
+_PROBE_CACHE = {} # name -> (computed_at, value)
+
+# Polling dashboards reuse this instead of re-hitting the server every tick
+# (/api/system/info revalidates with an ETag instead: it must reflect a git sync promptly)
+HEALTH_CACHE_CONTROL = "public, max-age=10, stale-while-revalidate=60"
+
+async def _cached_probe(name, compute):
+    """Returns `await compute()`'s result, reusing it for PROBE_TTL seconds."""
+    hit = _PROBE_CACHE.get(name)
+    if hit and time.monotonic() - hit[0] < PROBE_TTL:
+        return hit[1]
+    value = await compute()
+    _PROBE_CACHE[name] = (time.monotonic(), value)
+    return value
+
+def _git_head(git_dir: str = ".git") -> str:
+    """Resolves HEAD to a commit hash by reading .git directly (loose ref, then packed-refs)."""
+    with open(os.path.join(git_dir, "HEAD")) as f:
+        head = f.read().strip()
+    if not head.startswith("ref: "):
+        return head
+    ref = head[5:]
+    ref_path = os.path.join(git_dir, ref)
+    if os.path.exists(ref_path):
+        with open(ref_path) as f:
+            return f.read().strip()
+    with open(os.path.join(git_dir, "packed-refs")) as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 2 and parts[1] == ref:
+                return parts[0]
+    raise FileNotFoundError(ref)
+
+def _git_info() -> dict:
+    try:
+        git_hash = _git_head()[:7]
+        git_msg = subprocess.check_output(["git", "log", "-1", "--pretty=%B"]).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        git_hash = "no-git"
+        git_msg = "Unknown"
+    return {"git_hash": git_hash, "last_commit": git_msg}
+
+# The git sync route calls refresh_git_info() directly; anything else that moves HEAD
+# (a pull from a shell) is caught by re-reading .git/HEAD at most every GIT_INFO_TTL.
+# `git log` is only forked when the hash actually changed.
+GIT_INFO_TTL = 5.0 # seconds
+_GIT_INFO = _git_info()
+_GIT_CHECKED_AT = time.monotonic()
+
+def refresh_git_info():
+    global _GIT_INFO, _GIT_CHECKED_AT
+    _GIT_INFO = _git_info()
+    _GIT_CHECKED_AT = time.monotonic()
+
+async def _current_git_info() -> dict:
+    global _GIT_CHECKED_AT
+    if time.monotonic() - _GIT_CHECKED_AT < GIT_INFO_TTL:
+        return _GIT_INFO
+    _GIT_CHECKED_AT = time.monotonic()
+    try:
+        head = _git_head()[:7]
+    except OSError:
+        head = "no-git"
+    if head != _GIT_INFO["git_hash"]:
+        await asyncio.to_thread(refresh_git_info)
+    return _GIT_INFO
+
+def _gb(n: int) -> str:
+    return f"{n / 1024 ** 3:.1f}G"
+
+def _vitals() -> str:
+    load = ", ".join(f"{x:.2f}" for x in os.getloadavg()) if hasattr(os, "getloadavg") else "n/a"
+    cpu = f"CPU: {_HOST_VITALS['cpu_usage']:.1f}% used | {psutil.cpu_count()} cores | load average: {load}"
+    vm = psutil.virtual_memory()
+    swap = psutil.swap_memory()
+    mem = (f"Mem:  total {_gb(vm.total)}  used {_gb(vm.used)}  available {_gb(vm.available)} ({vm.percent}%)\n"
+           f"Swap: total {_gb(swap.total)}  used {_gb(swap.used)}\n")
+    du = psutil.disk_usage('/')
+    disk = f"/: size {_gb(du.total)}  used {_gb(du.used)}  avail {_gb(du.free)} ({du.percent}%)\n"
+    return f"--- CPU VITAL ---\n{cpu}\n\n--- MEMORY VITAL ---\n{mem}\n--- DISK VITAL ---\n{disk}"
+
+async def _container_fleet() -> str:
+    """`docker ps` as an asyncio subprocess, so the event loop keeps serving while it runs."""
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "docker", "ps", "--format", "table {{.Names}}\t{{.Status}}",
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        out, err = await proc.communicate()
+        if proc.returncode:
+            raise RuntimeError(err.decode().strip() or f"exit {proc.returncode}")
+        return out.decode()
+    except Exception as e:
+        return f"unavailable ({e})\n"
+
+async def _system_report() -> str:
+    vitals, containers = await asyncio.gather(asyncio.to_thread(_vitals), _container_fleet())
+    return f"{vitals}--- CONTAINER FLEET ---\n{containers}"
+
 @router.get("/api/market/liquidity")
 async def get_liquidity(symbol: str = "BTCUSDT"):
     """Returns the latest institutional order book analysis for a given symbol."""
-    from web_ui.state import LIQUIDITY_STATE
     return LIQUIDITY_STATE.get(symbol, {"error": "No liquidity data available yet."})
 
-@router.get("/api/status")
-async def get_status():
-    """Returns the core system state (equity, regime, insights)."""
-    from database.models import DB_SESSION, Trade
-    from datetime import datetime, timedelta
-    from core.exchange_handler import ExchangeHandler
-    from web_ui.state import ASSET_STATE
+@ttl_cached(STATUS_TTL)
+async def _status_body(session: Session):
+    """Refreshes the equity/PnL/trade-count keys of SYSTEM_STATE and returns (etag, body)."""
     
     SYSTEM_STATE["active_orders"] = len(ACTIVE_TRADES)
     current_symbol = SYSTEM_STATE.get("symbol", "BTCUSDT")
     
     try:
-        session = DB_SESSION()
-        from config.settings import SETTINGS
         watchlist = SETTINGS.WATCHLIST
         
         total_equity = 0.0
@@ -46,44 +209,52 @@ async def get_status():
         asset_trades_open = 0
         asset_trades_closed = 0
         
-        cutoff = datetime.utcnow() - timedelta(hours=24)
+        cutoff = ts_ms() - 24 * 3600 * 1000
+        closed = Trade.status == 'CLOSED'
+        
+        # 1. Per-asset counts and realized PnL (24h + all time) in one grouped query
+        stats = {
+            row.symbol: row for row in session.query(
+                Trade.symbol,
+                func.count(Trade.id).label("total"),
+                func.sum(case((closed, 1), else_=0)).label("closed"),
+                func.sum(case((closed, Trade.pnl), else_=0.0)).label("realized"),
+                func.sum(case((and_(closed, Trade.exit_time >= cutoff), Trade.pnl), else_=0.0)).label("realized_24h"),
+            ).filter(Trade.symbol.in_(watchlist)).group_by(Trade.symbol)
+        }
+        
+        # 2. Open positions as plain column tuples (no ORM identity-map overhead)
+        open_by_symbol = {}
+        for row in session.query(Trade.symbol, Trade.entry_price, Trade.amount, Trade.side).filter(
+            Trade.status == 'OPEN', Trade.symbol.in_(watchlist)
+        ):
+            open_by_symbol.setdefault(row.symbol, []).append(row)
+        
+        # 3. Marks for every symbol with exposure, fetched concurrently
+        priced = list(open_by_symbol)
+        marks = dict(zip(priced, await asyncio.gather(
+            *(fetch_last_price(s) for s in priced), return_exceptions=True
+        )))
         
         # Calculate per asset
         for symbol in watchlist:
-            # 1. Realized 24h PnL
-            recent_closed = session.query(Trade).filter(
-                Trade.symbol == symbol,
-                Trade.status == 'CLOSED',
-                Trade.exit_time >= cutoff
-            ).all()
-            realized_24h = sum((t.pnl or 0.0) for t in recent_closed)
-            
-            # 2. Cumulative Realized PnL (all time)
-            all_closed = session.query(Trade).filter(
-                Trade.symbol == symbol,
-                Trade.status == 'CLOSED'
-            ).all()
-            total_realized = sum((t.pnl or 0.0) for t in all_closed)
-            
-            # 3. Unrealized PnL
-            unrealized_pnl = 0.0
-            open_trades = session.query(Trade).filter(
-                Trade.symbol == symbol,
-                Trade.status == 'OPEN'
-            ).all()
+            row = stats.get(symbol)
+            realized_24h = (row.realized_24h or 0.0) if row else 0.0
+            total_realized = (row.realized or 0.0) if row else 0.0
+            trades_count = row.total if row else 0
+            trades_closed = (row.closed or 0) if row else 0
+            open_trades = open_by_symbol.get(symbol, [])
             
             # Accumulate Total Counts
-            total_trades_count += session.query(Trade).filter(Trade.symbol == symbol).count()
+            total_trades_count += trades_count
             total_trades_open += len(open_trades)
-            total_trades_closed += len(all_closed)
+            total_trades_closed += trades_closed
             
+            # Unrealized PnL
+            unrealized_pnl = 0.0
             if open_trades:
-                try:
-                    bridge = ExchangeHandler()
-                    client = await bridge._get_client(force_public=True)
-                    ticker = await client.fetch_ticker(symbol)
-                    p = ticker.get("last", 0.0)
-                except:
+                p = marks[symbol]
+                if isinstance(p, BaseException):
                     p = SYSTEM_STATE.get("price", 0.0) if symbol == current_symbol else 0.0
                 
                 if p > 0:
@@ -103,9 +274,9 @@ async def get_status():
             if symbol == current_symbol:
                 asset_equity = current_asset_equity
                 asset_pnl_24h = current_asset_pnl_24h
-                asset_trades_count = session.query(Trade).filter(Trade.symbol == current_symbol).count()
+                asset_trades_count = trades_count
                 asset_trades_open = len(open_trades)
-                asset_trades_closed = len(all_closed)
+                asset_trades_closed = trades_closed
                 
             # Internal state tracking
             if symbol not in ASSET_STATE:
@@ -129,71 +300,103 @@ async def get_status():
         SYSTEM_STATE["trades_total"] = total_trades_count
         SYSTEM_STATE["trades_open"] = total_trades_open
         SYSTEM_STATE["trades_closed"] = total_trades_closed
-        
-        session.close()
     except Exception as e:
-        import traceback
         logger.error(f"Status Calculation Error: {e}\n{traceback.format_exc()}")
     
-    return SYSTEM_STATE
+    # ETag = checksum of the serialized state: unchanged polls get an empty 304
+    body = _dumps(SYSTEM_STATE)
+    return f'"{_BOOT_ID}-{zlib.crc32(body):08x}"', body
+
+@router.get("/api/status")
+async def get_status(request: Request, session: Session = Depends(get_db)):
+    """Returns the core system state (equity, regime, insights)."""
+    etag, body = await _status_body(session)
+    return _conditional_json(request, etag, body)
 
 @router.get("/api/intelligence/flow")
 async def get_intel_flow():
     """Returns real-time flow of chart data, signals, and engine heartbeats."""
-    from web_ui.state import INTELLIGENCE_FLOW
-    return {"flow": INTELLIGENCE_FLOW}
+    return {"flow": list(INTELLIGENCE_FLOW)}
 
-@router.get("/api/system/health")
-async def get_health():
-    """Returns VPS health metrics."""
+def _health() -> dict:
     return {
-        "cpu_usage": psutil.cpu_percent(interval=0.1),
-        "ram_usage": psutil.virtual_memory().percent,
-        "disk_usage": psutil.disk_usage('/').percent,
-        "uptime": int(time.time() - psutil.boot_time()),
-        "platform": platform.system()
+        **_HOST_VITALS,
+        "uptime": int(time.time() - _HOST_BOOT_TIME),
+        "platform": _PLATFORM
     }
 
+@router.get("/api/system/health")
+async def get_health(response: Response):
+    """Returns VPS health metrics."""
+    response.headers["Cache-Control"] = HEALTH_CACHE_CONTROL
+    return _health()
+
 @router.get("/api/system/info")
-async def get_system_info():
-    """Returns version and git status."""
-    from config.settings import SETTINGS
-    try:
-        git_hash = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"]).decode().strip()
-        git_msg = subprocess.check_output(["git", "log", "-1", "--pretty=%B"]).decode().strip()
-    except:
-        git_hash = "no-git"
-        git_msg = "Unknown"
-    return {
+async def get_system_info(request: Request):
+    """Returns version and git status (ETag/304: version and mode are fixed per boot, so the hash decides)."""
+    git_info = await _current_git_info()
+    return _conditional_json(request, f'"{_BOOT_ID}-{git_info["git_hash"]}"', lambda: _dumps({
         "version": SETTINGS.VERSION,
-        "git_hash": git_hash,
-        "last_commit": git_msg,
+        "git_hash": git_info["git_hash"],
+        "last_commit": git_info["last_commit"],
         "mode": SETTINGS.MODE
-    }
+    }))
 
 @router.get("/api/system/report")
 async def get_system_report():
-    """Executes system commands for a full report."""
+    """Builds a full system report (psutil vitals + docker fleet), cached for PROBE_TTL."""
     try:
-        cpu = subprocess.check_output(["top", "-bn1"]).decode().split('\n')[2]
-        mem = subprocess.check_output(["free", "-h"]).decode()
-        disk = subprocess.check_output(["df", "-h", "/"]).decode()
-        containers = subprocess.check_output(["docker", "ps", "--format", "table {{.Names}}\t{{.Status}}"]).decode()
-        report = f"--- CPU VITAL ---\n{cpu}\n\n--- MEMORY VITAL ---\n{mem}\n--- DISK VITAL ---\n{disk}\n--- CONTAINER FLEET ---\n{containers}"
+        report = await _cached_probe("report", _system_report)
         return {"report": report}
     except Exception as e:
         return {"report": f"Report Generation Error: {str(e)}"}
 
+def _log_delta(cursor: str) -> bytes:
+    """
+    Entries appended after `cursor` (as returned by the previous call). A cursor from
+    another process, another epoch (logs cleared) or too far behind gets the full
+    history with reset=True.
+    """
+    epoch_key = f"{_BOOT_ID}-{log_epoch()}"
+    version = log_version()
+    prefix, _, seen = cursor.rpartition("-")
+    if prefix == epoch_key and seen.isdigit() and version - len(LOG_HISTORY) <= int(seen) <= version:
+        new = version - int(seen)
+        logs, reset = list(islice(LOG_HISTORY, len(LOG_HISTORY) - new, None)), False
+    else:
+        logs, reset = list(LOG_HISTORY), True
+    return _dumps({"cursor": f"{epoch_key}-{version}", "reset": reset, "logs": logs})
+
 @router.get("/api/logs")
-async def get_logs():
-    return LOG_HISTORY
+async def get_logs(request: Request, cursor: Optional[str] = None):
+    """Full log list (ETag/304), or with ?cursor= only the entries since the last poll."""
+    if cursor is not None:
+        return Response(_log_delta(cursor), media_type="application/json", headers={"Cache-Control": "no-store"})
+    return _conditional_json(request, f'"{_BOOT_ID}-{log_version()}"', lambda: _dumps(list(LOG_HISTORY)))
 
 @router.post("/api/system/cleanup")
 async def run_cleanup():
     """Performs basic housekeeping (clearing logs)."""
     try:
-        LOG_HISTORY.clear()
-        LOG_HISTORY.append({"time": time.time(), "msg": "Housekeeping: Logs cleared."})
+        clear_logs()
+        log_event("Housekeeping: Logs cleared.")
         return {"status": "success", "message": "Housekeeping complete. Logs cleared."}
     except Exception as e:
         return {"status": "error", "message": str(e)}
+
+# ─── Dashboard Batch ─────────────────────────────────────────────
+@router.get("/api/dashboard")
+async def get_dashboard(cursor: str = "", session: Session = Depends(get_db)):
+    """
+    One poll for the dashboard's fast-refresh panels: status, host health, the log delta
+    (same cursor protocol as /api/logs) and the approval queue. Status and logs are
+    already-serialized bytes, embedded as orjson Fragments rather than re-encoded.
+    """
+    _, status_body = await _status_body(session)
+    body = _dumps({
+        "status": orjson.Fragment(status_body),
+        "health": _health(),
+        "logs": orjson.Fragment(_log_delta(cursor)),
+        "approvals": list(APPROVAL_QUEUE.values())
+    })
+    return Response(body, media_type="application/json", headers={"Cache-Control": "no-store"})
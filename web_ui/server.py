@@ -4,46 +4,75 @@ All routes are split into modular files under web_ui/routes/.
 Shared state lives in web_ui/state.py.
 """
 import os
-import time
+import re
+import queue
 import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from loguru import logger
 from database.models import DB_SESSION, Trade
+from core.exchange_handler import close_exchange_clients
+from core.strategy_kind import StrategyKind
 
 # ─── Import Shared State ─────────────────────────────────────────
 from web_ui.state import (
-    SYSTEM_STATE, LOG_HISTORY, RECON_HISTORY,
+    SYSTEM_STATE, RECON_HISTORY,
     ACTIVE_TRADES, APPROVAL_QUEUE, EQUITY_HISTORY,
-    PREDICTION_STATE
+    PREDICTION_STATE, ActiveTrade, add_active_trade, track_scalp, log_event
 )
 
+# ─── Log Categories ──────────────────────────────────────────────
+# One case-insensitive pass per rule instead of upper()-ing the message for every keyword list
+_ERR_RE = re.compile(r"ALERT|FAILURE", re.I)
+_TRADE_RE = re.compile(r"ORDER|TRADE|CLOSED|ENTRY|PNL|FILLED|POSITION", re.I)
+_EXCH_RE = re.compile(r"SYNC|MARKET|PRICE|RSI|FUNDING|TICKER", re.I)
+_ERR_LEVELS = frozenset({"ERROR", "CRITICAL", "WARNING"})
+
+def log_category(msg: str, level: str) -> str:
+    """Dashboard log category (ERR > TRADE > EXCH > CORE) for a message."""
+    if level in _ERR_LEVELS or _ERR_RE.search(msg):
+        return "ERR"
+    if _TRADE_RE.search(msg):
+        return "TRADE"
+    if _EXCH_RE.search(msg):
+        return "EXCH"
+    return "CORE"
+
 # ─── Boot: Load Historical Logs ──────────────────────────────────
+LOG_TAIL_LINES = 100
+LOG_TAIL_BLOCK = 8192
+
+def tail_lines(path: str, n: int, block: int = LOG_TAIL_BLOCK) -> list:
+    """Last `n` lines of a file, read backwards from EOF in blocks (I/O ~ tail size, not file size)."""
+    with open(path, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        chunks = deque()
+        newlines = 0
+        # One extra newline so the first kept line is complete
+        while pos > 0 and newlines <= n:
+            step = min(block, pos)
+            pos -= step
+            f.seek(pos)
+            chunk = f.read(step)
+            chunks.appendleft(chunk)
+            newlines += chunk.count(b"\n")
+    return b"".join(chunks).decode('utf-8', 'replace').splitlines()[-n:]
+
 def load_log_file():
     """Initializes LOG_HISTORY with the last entries from the log file."""
     log_file = "logs/engine.log"
     if os.path.exists(log_file):
         try:
-            with open(log_file, 'r') as f:
-                lines = f.readlines()[-100:]
-                for line in lines:
-                    parts = line.strip().split(" | ")
-                    if len(parts) >= 3:
-                        raw_msg = parts[-1]
-                        level = parts[1].strip() if len(parts) > 1 else "INFO"
-                        cat = "CORE"
-                        if any(x in raw_msg.upper() for x in ["SYNC", "MARKET", "PRICE", "RSI"]):
-                            cat = "EXCH"
-                        if any(x in raw_msg.upper() for x in ["ORDER", "TRADE", "CLOSED", "PNL"]):
-                            cat = "TRADE"
-                        if level in ["ERROR", "CRITICAL", "WARNING"]:
-                            cat = "ERR"
-                        LOG_HISTORY.append({
-                            "time": time.time(),
-                            "msg": f"[{level}] {raw_msg}",
-                            "cat": cat
-                        })
+            for line in tail_lines(log_file, LOG_TAIL_LINES):
+                parts = line.strip().split(" | ")
+                if len(parts) >= 3:
+                    raw_msg = parts[-1]
+                    level = parts[1].strip()
+                    log_event(f"[{level}] {raw_msg}", cat=log_category(raw_msg, level))
         except Exception as e:
             logger.error(f"Failed to load historical logs: {e}")
 
@@ -53,98 +82,119 @@ load_log_file()
 def load_persistence():
     """Loads previous session state from SQLite."""
     from web_ui.state import TRADE_LOG_HISTORY
+    # Plain column tuples (attribute access by name) instead of full ORM instances
+    columns = (
+        Trade.id, Trade.symbol, Trade.side, Trade.status, Trade.strategy, Trade.trade_code, Trade.order_id,
+        Trade.entry_time, Trade.entry_price, Trade.amount, Trade.leverage, Trade.pnl, Trade.exit_time, Trade.exit_price
+    )
     try:
-        session = DB_SESSION()
-        # 1. Load Active Trades
-        trades = session.query(Trade).filter(Trade.status == 'OPEN').all()
-        for t in trades:
-            ACTIVE_TRADES.append({
-                "id": t.id,
-                "time": t.entry_time.timestamp(),
-                "symbol": t.symbol,
-                "type": f"{t.side.upper()} ({t.strategy.split('_')[0] if t.strategy else 'MANUAL'})",
-                "status": t.status,
-                "pnl": f"${t.pnl:.2f}" if t.pnl else "$0.00",
-                "entry_price": t.entry_price or 0.0,
-                "amount": t.amount or 0.0,
-                "trade_code": t.trade_code,
-                "order_id": t.order_id,
-                "reason": t.strategy or "Persistent Trade",
-                "leverage": t.leverage or 1
-            })
+        with DB_SESSION() as session:
+            # 1. Load Active Trades (streamed in batches)
+            trades = session.query(*columns).filter(Trade.status == 'OPEN').yield_per(100)
+            for t in trades:
+                kind = StrategyKind.from_reason(t.strategy)
+                add_active_trade(ActiveTrade(
+                    id=t.id,
+                    time=t.entry_time / 1000,
+                    symbol=t.symbol,
+                    side=t.side.upper(),
+                    type=f"{t.side.upper()} ({t.strategy.split('_')[0] if t.strategy else 'MANUAL'})",
+                    status=t.status,
+                    pnl=f"${t.pnl:.2f}" if t.pnl else "$0.00",
+                    entry_price=t.entry_price or 0.0,
+                    amount=t.amount or 0.0,
+                    trade_code=t.trade_code,
+                    order_id=t.order_id,
+                    reason=t.strategy or "Persistent Trade",
+                    kind=kind,
+                    leverage=t.leverage or 1
+                ))
+                track_scalp(t.symbol, kind)
             
-        # 2. Re-hydrate Trade Log History with last 20 events
-        history = session.query(Trade).order_by(Trade.id.desc()).limit(20).all()
-        for h in reversed(history):
-            # Add Entry Event
-            TRADE_LOG_HISTORY.append({
-                "timestamp": h.entry_time.timestamp(),
-                "action": "ENTRY",
-                "symbol": h.symbol,
-                "type": h.side,
-                "price": h.entry_price,
-                "amount": h.amount,
-                "leverage": h.leverage or 1,
-                "reason": h.strategy
-            })
-            # Add Exit Event if closed
-            if h.status == "CLOSED" and h.exit_time:
+            # 2. Re-hydrate Trade Log History with last 20 events
+            history = session.query(*columns).order_by(Trade.id.desc()).limit(20).all()
+            for h in reversed(history):
+                # Add Entry Event
                 TRADE_LOG_HISTORY.append({
-                    "timestamp": h.exit_time.timestamp(),
-                    "action": "EXIT",
+                    "timestamp": h.entry_time / 1000,
+                    "action": "ENTRY",
                     "symbol": h.symbol,
                     "type": h.side,
-                    "price": h.exit_price,
+                    "price": h.entry_price,
                     "amount": h.amount,
                     "leverage": h.leverage or 1,
-                    "pnl": h.pnl,
-                    "pnl_pct": ((h.exit_price - h.entry_price) / h.entry_price * 100 * (1 if h.side == "BUY" else -1)) if h.entry_price else 0,
-                    "reason": "Persistence Recovery"
+                    "reason": h.strategy
                 })
+                # Add Exit Event if closed
+                if h.status == "CLOSED" and h.exit_time:
+                    TRADE_LOG_HISTORY.append({
+                        "timestamp": h.exit_time / 1000,
+                        "action": "EXIT",
+                        "symbol": h.symbol,
+                        "type": h.side,
+                        "price": h.exit_price,
+                        "amount": h.amount,
+                        "leverage": h.leverage or 1,
+                        "pnl": h.pnl,
+                        "pnl_pct": ((h.exit_price - h.entry_price) / h.entry_price * 100 * (1 if h.side == "BUY" else -1)) if h.entry_price else 0,
+                        "reason": "Persistence Recovery"
+                    })
         
         logger.info(f"Database: Loaded {len(ACTIVE_TRADES)} active and {len(TRADE_LOG_HISTORY)} historical events.")
-        session.close()
     except Exception as e:
         logger.error(f"Persistence Load Error: {e}")
 
 load_persistence()
 
 # ─── Real-time Log Bridge ────────────────────────────────────────
+# The sink runs on whichever thread logged, so it only enqueues; one task on the
+# event loop categorizes and appends in batches (LOG_HISTORY has a single writer).
+LOG_FLUSH_INTERVAL = 0.05 # seconds
+LOG_FLUSH_BATCH = 256
+_LOG_INBOX = queue.SimpleQueue() # (level, message, epoch seconds)
+
 def ui_log_sink(message):
-    """Pushes every logger call into the Dashboard UI."""
-    try:
-        record = message.record
-        msg_text = record["message"]
-        level = record["level"].name
-        
-        cat = "CORE"
-        if any(x in msg_text.upper() for x in ["SYNC", "MARKET", "PRICE", "RSI", "FUNDING", "TICKER"]):
-            cat = "EXCH"
-        if any(x in msg_text.upper() for x in ["ORDER", "TRADE", "CLOSED", "ENTRY", "PNL", "FILLED", "POSITION"]):
-            cat = "TRADE"
-        if level in ["ERROR", "CRITICAL", "WARNING"] or "ALERT" in msg_text.upper() or "FAILURE" in msg_text.upper():
-            cat = "ERR"
-            
-        log_entry = {
-            "time": time.time(),
-            "msg": f"[{level}] {msg_text}",
-            "cat": cat
-        }
-        LOG_HISTORY.append(log_entry)
-        if len(LOG_HISTORY) > 1000: LOG_HISTORY.pop(0)
-    except:
-        pass
+    """Pushes every logger call into the Dashboard UI (via _LOG_INBOX)."""
+    record = getattr(message, "record", None)
+    if record is None:
+        return
+    _LOG_INBOX.put_nowait((record["level"].name, record["message"], record["time"].timestamp()))
+
+def _flush_log_inbox(limit: int = LOG_FLUSH_BATCH):
+    for _ in range(limit):
+        try:
+            level, msg_text, t = _LOG_INBOX.get_nowait()
+        except queue.Empty:
+            return
+        log_event(f"[{level}] {msg_text}", cat=log_category(msg_text, level), t=t)
+
+async def drain_log_inbox():
+    """Background task (started by the app lifespan): moves queued log lines into LOG_HISTORY."""
+    while True:
+        _flush_log_inbox()
+        await asyncio.sleep(LOG_FLUSH_INTERVAL)
 
 _UI_SINK_ADDED = False
 if not globals().get("_UI_SINK_ADDED", False):
     logger.add(ui_log_sink, format="{message}", level="DEBUG")
     globals()["_UI_SINK_ADDED"] = True
 
-# ─── Host Metrics Path (Docker) ──────────────────────────────────
-os.environ["PROCFS_PATH"] = "/host/proc"
-
 # ─── FastAPI App ─────────────────────────────────────────────────
-app = FastAPI(title="DaNoo - Strategy Intelligence Engine v5.2")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    from web_ui.routes.status import host_sampler
+    sampler = asyncio.create_task(host_sampler())
+    log_drain = asyncio.create_task(drain_log_inbox())
+    yield
+    sampler.cancel()
+    log_drain.cancel()
+    # Shutdown: the ccxt and Intel Service clients are process-wide and only released here
+    from web_ui.routes.admin import INTEL_CLIENT
+    await close_exchange_clients()
+    await INTEL_CLIENT.aclose()
+
+# orjson-backed responses for every route by default (the dashboard polls several endpoints per second)
+app = FastAPI(title="DaNoo - Strategy Intelligence Engine v5.2", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Mount static files and templates
 app.mount("/static", StaticFiles(directory="web_ui/static"), name="static")
@@ -170,6 +220,8 @@ async def read_root(request: Request):
 import uvicorn
 
 def start_ui_server():
-    config = uvicorn.Config(app, host="0.0.0.0", port=8000, log_level="info")
+    # http="auto" picks the C httptools parser when installed; access lines for the dashboard's
+    # constant polling are per-request overhead with no diagnostic value.
+    config = uvicorn.Config(app, host="0.0.0.0", port=8000, log_level="info", access_log=False)
     server = uvicorn.Server(config)
     return server
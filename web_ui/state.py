@@ -3,7 +3,12 @@ Centralized State Management for DaNoo.
 All shared state containers live here to eliminate circular imports.
 """
 import time
+import itertools
+from collections import Counter, OrderedDict, defaultdict, deque
+from dataclasses import dataclass
+from typing import Optional
 from config.settings import SETTINGS
+from core.strategy_kind import StrategyKind, SCALPER_KINDS
 
 # ─── Core System State ───────────────────────────────────────────
 SYSTEM_STATE = {
@@ -36,11 +41,98 @@ ASSET_STATE = {}
 PREDICTION_STATE = {}
 LIQUIDITY_STATE = {} # Institutional Order Book Depth
 
+# ─── Trade Records ───────────────────────────────────────────────
+@dataclass(slots=True)
+class ActiveTrade:
+    """An open position. Field names double as the JSON keys the dashboard reads."""
+    id: int
+    time: float
+    symbol: str
+    side: str # BUY / SELL
+    type: str # display label, e.g. "BUY (STRICT)"
+    order_id: str
+    reason: str
+    kind: StrategyKind = StrategyKind.MANUAL
+    entry_price: float = 0.0
+    amount: float = 0.0
+    leverage: int = 1
+    status: str = "OPEN"
+    trade_code: Optional[str] = None
+    pnl: str = "$0.00"
+    cost: Optional[str] = None
+    value: Optional[str] = None
+    conviction: Optional[str] = None
+    risk: Optional[str] = None
+
 # ─── Data Containers ─────────────────────────────────────────────
-LOG_HISTORY = []
-RECON_HISTORY = []
-ACTIVE_TRADES = []
-APPROVAL_QUEUE = []
-EQUITY_HISTORY = []
-TRADE_LOG_HISTORY = [] # Detailed trade execution logs
-INTELLIGENCE_FLOW = [] # Real-time flow of chart data, signals, and engine heartbeats
+LOG_HISTORY = deque(maxlen=1000) # Bounded: oldest entries drop off automatically
+RECON_HISTORY = deque(maxlen=50)
+ACTIVE_TRADES = OrderedDict() # order_id -> ActiveTrade, in display order (O(1) lookup/close by order id)
+APPROVAL_QUEUE = {} # signal id -> pending signal (id also stored in the entry for the UI)
+EQUITY_HISTORY = deque(maxlen=50) # exactly the window the Performance chart plots
+TRADE_LOG_HISTORY = deque(maxlen=500) # Detailed trade execution logs (bounded like LOG_HISTORY)
+INTELLIGENCE_FLOW = deque(maxlen=100) # Real-time flow of chart data, signals, and engine heartbeats
+
+# Bumped on every LOG_HISTORY append; /api/logs uses it as its ETag and delta cursor.
+# Within one epoch the deque holds exactly appends (version - len, version].
+_LOG_VERSION = 0
+_LOG_EPOCH = 0 # bumped by clear_logs(), so delta clients know to reload in full
+
+def log_version() -> int:
+    return _LOG_VERSION
+
+def log_epoch() -> int:
+    return _LOG_EPOCH
+
+def clear_logs():
+    global _LOG_EPOCH
+    LOG_HISTORY.clear()
+    _LOG_EPOCH += 1
+
+def log_event(msg: str, cat: Optional[str] = None, t: Optional[float] = None):
+    """
+    Appends a dashboard log entry. `time` is epoch seconds (a number, formatted
+    client-side); `cat` is the UI tab filter and is omitted when not set.
+    """
+    global _LOG_VERSION
+    entry = {"time": time.time() if t is None else t, "msg": msg}
+    if cat is not None:
+        entry["cat"] = cat
+    LOG_HISTORY.append(entry)
+    _LOG_VERSION += 1
+
+def add_active_trade(trade: ActiveTrade, first: bool = False):
+    """Registers an open position under its order id; `first` puts it at the top of the list."""
+    ACTIVE_TRADES[trade.order_id] = trade
+    if first:
+        ACTIVE_TRADES.move_to_end(trade.order_id, last=False)
+
+_APPROVAL_IDS = itertools.count(1)
+
+def enqueue_approval(signal: dict) -> int:
+    """Queues a signal for manual approval under a fresh id and returns the id."""
+    sid = next(_APPROVAL_IDS)
+    signal["id"] = sid
+    APPROVAL_QUEUE[sid] = signal
+    return sid
+
+# ─── Indexes ─────────────────────────────────────────────────────
+# symbol -> Counter(StrategyKind -> open scalper trades (STRICT/LOOSE/RECON) in ACTIVE_TRADES).
+# Counted, not a set: two open trades of one kind on a symbol must both close before it frees up.
+SCALP_INDEX = defaultdict(Counter)
+
+def track_scalp(symbol: str, kind: StrategyKind):
+    """Registers an open scalper trade in SCALP_INDEX (other kinds are ignored)."""
+    if kind in SCALPER_KINDS:
+        SCALP_INDEX[symbol][kind] += 1
+
+def untrack_scalp(symbol: str, kind: StrategyKind):
+    """Drops one closed scalper trade from SCALP_INDEX, removing kinds and symbols that reach zero."""
+    kinds = SCALP_INDEX.get(symbol)
+    if kinds is None or kind not in kinds:
+        return
+    kinds[kind] -= 1
+    if kinds[kind] <= 0:
+        del kinds[kind]
+    if not kinds:
+        del SCALP_INDEX[symbol]
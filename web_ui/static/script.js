@@ -2,6 +2,9 @@ const get = (id) => document.getElementById(id);
 
 let expandedGroups = new Set();
 let activeLogTab = "ALL";
+let logBuffer = []; // mirror of the server's LOG_HISTORY, grown from /api/logs deltas
+let logCursor = "";
+const LOG_BUFFER_MAX = 1000;
 let isDraggingFab = false;
 let activeTradeTab = "ALL";
 let activeStratFilter = "ALL";
@@ -98,7 +101,7 @@ async function updateChart() {
         const res = await fetch('/api/chart');
         const data = await res.json();
         if (pnlChart && pnlChart.data) {
-            pnlChart.data.labels = data.labels;
+            pnlChart.data.labels = data.values.map((_, i) => `T-${data.values.length - i - 1}`);
             pnlChart.data.datasets[0].data = data.values;
             pnlChart.update();
         }
@@ -313,7 +316,12 @@ window.togglePerformanceMode = () => {
 async function syncDashboard() {
     try {
         const res = await fetch('/api/status');
-        const data = await res.json();
+        renderStatus(await res.json());
+    } catch (e) { }
+}
+
+function renderStatus(data) {
+    try {
 
         // Use appropriate keys based on toggle
         const displayEquity = perfMode === 'TOTAL' ? data.total_equity : data.asset_equity;
@@ -811,21 +819,26 @@ async function updateLiquidity() {
 async function updateApprovals() {
     try {
         const res = await fetch('/api/system/approvals');
-        const data = await res.json();
+        renderApprovals((await res.json()).approvals);
+    } catch (e) { }
+}
+
+function renderApprovals(approvals) {
+    try {
         const container = get('approval-list');
-        if (!data.approvals || data.approvals.length === 0) {
+        if (!approvals || approvals.length === 0) {
             container.innerHTML = '<div class="card-item"><div class="card-body" style="color: var(--text-dim); text-align: center;">Queue empty.</div></div>';
             return;
         }
 
-        container.innerHTML = data.approvals.map((a, index) => `
+        container.innerHTML = approvals.map(a => `
             <div class="card-item" style="border-left: 2px solid var(--magenta);">
                 <div class="card-meta"><span>SIGNAL</span><span>${formatTime(a.time)}</span></div>
                 <div class="card-header">${a.signal}</div>
                 <div class="card-body">
                     AI Sentiment: ${a.sentiment}
                     <div style="font-size: 0.6rem; color: var(--text-dim); margin-bottom: 6px;">${a.reason || 'Pending scan justification...'}</div>
-                    <button class="btn-sm" style="font-size: 0.5rem; float:right;" onclick="approveTrade(${index})">APPROVE</button>
+                    <button class="btn-sm" style="font-size: 0.5rem; float:right;" onclick="approveTrade(${a.id})">APPROVE</button>
                 </div>
             </div>
         `).join('');
@@ -870,7 +883,12 @@ async function closeTrade(order_id) {
 async function updateHealth() {
     try {
         const res = await fetch('/api/system/health');
-        const data = await res.json();
+        renderHealth(await res.json());
+    } catch (e) { }
+}
+
+function renderHealth(data) {
+    try {
         get('cpu-val').textContent = `${Math.round(data.cpu_usage)}%`;
         get('ram-val').textContent = `${Math.round(data.ram_usage)}%`;
         get('disk-val').textContent = `${Math.round(data.disk_usage)}%`;
@@ -948,41 +966,72 @@ async function updateLogs() {
             return;
         }
 
-        const res = await fetch('/api/logs');
+        // Delta poll: only entries appended since logCursor (full list when reset)
+        const sentCursor = logCursor;
+        const res = await fetch(`/api/logs?cursor=${encodeURIComponent(sentCursor)}`);
         if (!res.ok) throw new Error("Server Log Error");
-        let logs = await res.json();
+        mergeLogDelta(await res.json(), sentCursor);
+        renderLogBuffer(container);
+    } catch (e) {
+        console.error("Logs sync failed", e);
+    }
+}
 
-        // Filter by Tab
-        if (activeLogTab !== "ALL") {
-            logs = logs.filter(l => l.cat === activeLogTab);
-        }
+// `sentCursor` is the cursor the request went out with: if another poll already advanced
+// logCursor, this delta overlaps what was merged and is dropped (no duplicated entries)
+function mergeLogDelta(delta, sentCursor) {
+    if (sentCursor !== logCursor) return;
+    logBuffer = delta.reset ? delta.logs : logBuffer.concat(delta.logs);
+    if (logBuffer.length > LOG_BUFFER_MAX) logBuffer = logBuffer.slice(-LOG_BUFFER_MAX);
+    logCursor = delta.cursor;
+}
 
-        if (!logs || logs.length === 0) {
-            container.innerHTML = `<div class="text-[10px] text-brand-dim text-center py-10 italic">No events found for ${activeLogTab}</div>`;
-            return;
-        }
+function renderLogBuffer(container) {
+    // Filter by Tab (copy either way: the render below reverses in place)
+    let logs = activeLogTab !== "ALL" ? logBuffer.filter(l => l.cat === activeLogTab) : logBuffer.slice();
 
-        const isScrolledToBottom = container.scrollHeight - container.clientHeight <= container.scrollTop + 100;
+    if (!logs || logs.length === 0) {
+        container.innerHTML = `<div class="text-[10px] text-brand-dim text-center py-10 italic">No events found for ${activeLogTab}</div>`;
+        return;
+    }
 
-        container.innerHTML = logs.reverse().map(l => {
-            const levelMatch = l.msg.match(/^\[(INFO|ERROR|SUCCESS|WARNING)\]/);
-            const level = levelMatch ? levelMatch[1] : (l.msg.includes('SUCCESS') ? 'SUCCESS' : 'INFO');
-            const cleanMsg = l.msg.replace(/^\[.*?\]/, '').trim();
-            const color = level === 'ERROR' ? '#ff4444' : (level === 'SUCCESS' ? '#00ff64' : (level === 'WARNING' ? '#ffbb00' : '#fff'));
+    const isScrolledToBottom = container.scrollHeight - container.clientHeight <= container.scrollTop + 100;
 
-            return `
-                <div style="margin-bottom: 8px; font-size: 11px; line-height: 1.4; border-bottom: 1px solid rgba(255,255,255,0.03); padding-bottom: 4px; display: flex; gap: 8px;">
-                    <span style="color: var(--cyan-brand); font-weight: bold; min-width: 60px;">${formatTime(l.time, true)}</span>
-                    <span style="color: ${color}; opacity: 0.9;">${cleanMsg}</span>
-                </div>
-            `;
-        }).join('');
+    container.innerHTML = logs.reverse().map(l => {
+        const levelMatch = l.msg.match(/^\[(INFO|ERROR|SUCCESS|WARNING)\]/);
+        const level = levelMatch ? levelMatch[1] : (l.msg.includes('SUCCESS') ? 'SUCCESS' : 'INFO');
+        const cleanMsg = l.msg.replace(/^\[.*?\]/, '').trim();
+        const color = level === 'ERROR' ? '#ff4444' : (level === 'SUCCESS' ? '#00ff64' : (level === 'WARNING' ? '#ffbb00' : '#fff'));
 
-        if (isScrolledToBottom) {
-            container.scrollTop = container.scrollHeight;
-        }
+        return `
+            <div style="margin-bottom: 8px; font-size: 11px; line-height: 1.4; border-bottom: 1px solid rgba(255,255,255,0.03); padding-bottom: 4px; display: flex; gap: 8px;">
+                <span style="color: var(--cyan-brand); font-weight: bold; min-width: 60px;">${formatTime(l.time, true)}</span>
+                <span style="color: ${color}; opacity: 0.9;">${cleanMsg}</span>
+            </div>
+        `;
+    }).join('');
+
+    if (isScrolledToBottom) {
+        container.scrollTop = container.scrollHeight;
+    }
+}
+
+// One batched poll for status, host health, the log delta and approvals (/api/dashboard)
+async function pollDashboard() {
+    try {
+        const sentCursor = logCursor;
+        const res = await fetch(`/api/dashboard?cursor=${encodeURIComponent(sentCursor)}`);
+        if (!res.ok) throw new Error("Dashboard Sync Error");
+        const data = await res.json();
+        renderStatus(data.status);
+        renderHealth(data.health);
+        renderApprovals(data.approvals);
+        mergeLogDelta(data.logs, sentCursor);
+        const container = get('log-list');
+        if (activeLogTab === "TRADE" || activeLogTab === "INTEL") updateLogs();
+        else if (container) renderLogBuffer(container);
     } catch (e) {
-        console.error("Logs sync failed", e);
+        console.error("Dashboard sync failed", e);
     }
 }
 
@@ -1157,13 +1206,10 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 
     // Loops
-    setInterval(syncDashboard, 1500);
+    setInterval(pollDashboard, 1500); // status, health, logs, approvals
     setInterval(updateChart, 5000);
-    setInterval(updateHealth, 5000);
-    setInterval(updateLogs, 2000);
     setInterval(updateRecon, 5000);
     setInterval(updateTrades, 3000);
-    setInterval(updateApprovals, 3000);
     setInterval(updateFiles, 10000);
     setInterval(updateTicker, 5000);
     setInterval(updatePrediction, 10000);